@@ -0,0 +1,35 @@
+"""
+Shared httpx client  one pooled AsyncClient for every HTTP-based provider.
+Created lazily (or at startup via main.py lifespan) and closed on shutdown.
+Non-streaming calls pass their own timeout per request; streams use the
+client default, which has no read timeout.
+"""
+
+import httpx
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the process-wide AsyncClient, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=32,
+                keepalive_expiry=60.0,
+            ),
+            http2=True,
+            # Fail fast on connect/pool, but never cut off a slow token stream
+            timeout=httpx.Timeout(connect=3.0, read=None, write=30.0, pool=5.0),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared client (called from main.py lifespan on shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import AsyncGenerator
 
@@ -29,6 +30,26 @@ class BaseLLM(ABC):
         result = await self.chat(messages, temperature=temperature, max_tokens=max_tokens)
         yield result
 
+    async def abatch(
+        self,
+        batch: list[list[dict]],
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        concurrency: int = 10,
+    ) -> list[str | BaseException]:
+        """
+        Run chat() for every message list in batch concurrently, at most
+        `concurrency` requests in flight. Results keep the input order;
+        a failed call yields its exception in place of the text.
+        """
+        sem = asyncio.Semaphore(max(1, concurrency))
+
+        async def one(messages: list[dict]) -> str:
+            async with sem:
+                return await self.chat(messages, temperature=temperature, max_tokens=max_tokens)
+
+        return await asyncio.gather(*(one(m) for m in batch), return_exceptions=True)
+
     @abstractmethod
     async def list_models(self) -> list[str]:
         """Return list of available model names for this provider."""
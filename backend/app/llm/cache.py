@@ -0,0 +1,138 @@
+"""
+LLM response cache  exact-match cache for deterministic chat calls.
+
+Only calls with temperature == 0 are cached; the key is a SHA-256 over
+(provider, model, messages, temperature, max_tokens). Storage goes through a
+small async backend protocol so the in-memory LRU can be swapped for
+Redis/Memcached without touching the providers. An optional semantic tier
+(semantic_cache.py) is consulted after an exact miss.
+"""
+
+import functools
+import hashlib
+import inspect
+import time
+from collections import OrderedDict
+from typing import Protocol
+
+import orjson
+
+from .semantic_cache import semantic_cache
+
+DEFAULT_TTL = 3600
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> str | None: ...
+    async def set(self, key: str, value: str, ttl: int) -> None: ...
+
+
+class MemoryBackend:
+    """In-process LRU with per-entry expiry."""
+
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+    async def get(self, key: str) -> str | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires, value = entry
+        if time.monotonic() >= expires:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: str, ttl: int) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+class LLMCache:
+    def __init__(self, backend: CacheBackend | None = None):
+        self.backend = backend or MemoryBackend()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(provider: str, model: str, messages: list[dict],
+                 temperature: float, max_tokens: int) -> str:
+        payload = {"p": provider, "m": model, "ms": messages, "t": temperature, "mt": max_tokens}
+        return hashlib.sha256(orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+    async def get(self, key: str) -> str | None:
+        value = await self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: str, ttl: int = DEFAULT_TTL) -> None:
+        await self.backend.set(key, value, ttl)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+# Process-wide cache shared by all providers
+llm_cache = LLMCache()
+
+
+def _cacheable(provider: str, text: str) -> bool:
+    # Skip empty replies and the providers' own "[OpenAI error] ..." style notices
+    return bool(text) and text[:len(provider) + 1].lower() != f"[{provider}"
+
+
+def cached_chat(fn):
+    """
+    Decorate a provider's chat() so deterministic calls are served from
+    llm_cache, with the optional semantic tier consulted on an exact miss.
+    """
+    sig = inspect.signature(fn)
+
+    @functools.wraps(fn)
+    async def wrapper(self, *args, **kwargs):
+        bound = sig.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        temperature = bound.arguments["temperature"]
+        exact = temperature == 0
+        semantic = semantic_cache.enabled()
+        if not exact and not semantic:
+            return await fn(self, *args, **kwargs)
+
+        messages = bound.arguments["messages"]
+        key = probe = None
+        if exact:
+            key = LLMCache.make_key(
+                self.provider_name, self.model, messages,
+                temperature, bound.arguments["max_tokens"],
+            )
+            hit = await llm_cache.get(key)
+            if hit is not None:
+                return hit
+        if semantic:
+            hit, probe = await semantic_cache.lookup(
+                self.provider_name, self.model, temperature, messages,
+            )
+            if hit is not None:
+                return hit
+
+        text = await fn(self, *args, **kwargs)
+        if _cacheable(self.provider_name, text):
+            if key is not None:
+                await llm_cache.set(key, text, ttl=DEFAULT_TTL)
+            if probe is not None:
+                semantic_cache.store(probe, text)
+        return text
+
+    return wrapper
@@ -1,5 +1,7 @@
 import os
+import time
 from .base import BaseLLM
+from .cache import cached_chat
 
 try:
     from google import genai
@@ -9,6 +11,40 @@ except ImportError:
     _gemini_available = False
 
 
+# How long a fetched model list is reused before asking the API again
+MODELS_TTL = 300.0
+
+# OpenAI-style roles  Gemini content roles (system messages go to system_instruction)
+_ROLE_MAP = {"user": "user", "assistant": "model", "model": "model"}
+
+
+def _text_of(content) -> str:
+    """Flatten str or multimodal list content to its text parts."""
+    if isinstance(content, str):
+        return content
+    return "\n".join(
+        p.get("text", "") for p in content or [] if isinstance(p, dict) and p.get("type") == "text"
+    )
+
+
+def _to_contents(messages: list[dict]) -> tuple[str | None, list[dict]]:
+    """Convert chat messages to (system_instruction, Gemini multi-turn contents)."""
+    system_parts = []
+    contents = []
+    for m in messages:
+        text = _text_of(m["content"])
+        role = _ROLE_MAP.get(m["role"])
+        if role is None:
+            system_parts.append(text)
+        else:
+            contents.append({"role": role, "parts": [{"text": text}]})
+    system = "\n\n".join(system_parts) or None
+    if not contents and system:
+        # Gemini requires at least one content turn
+        return None, [{"role": "user", "parts": [{"text": system}]}]
+    return system, contents
+
+
 class GeminiLLM(BaseLLM):
     def __init__(self, model: str = "gemini-3.0-flash", api_key: str | None = None):
         self.model = model
@@ -18,6 +54,9 @@ class GeminiLLM(BaseLLM):
             self._client = genai.Client(api_key=api_key)
         else:
             self._client = None
+        # list_models memo: (fetched_at, models)
+        self._models_ts: float = 0.0
+        self._models_val: list[str] | None = None
 
     @property
     def provider_name(self) -> str:
@@ -29,11 +68,17 @@ class GeminiLLM(BaseLLM):
         try:
             if not self._client:
                 return ["gemini-3.0-flash", "gemini-3.0-pro", "gemini-3.0-flash"]
-            models = self._client.models.list()
-            return [m.name.split("/")[-1] for m in models if "generateContent" in (m.supported_actions or [])]
+            now = time.monotonic()
+            if self._models_val is not None and now - self._models_ts < MODELS_TTL:
+                return self._models_val
+            models = await self._client.aio.models.list()
+            self._models_val = [m.name.split("/")[-1] async for m in models if "generateContent" in (m.supported_actions or [])]
+            self._models_ts = now
+            return self._models_val
         except Exception:
             return ["gemini-3.0-flash", "gemini-3.0-pro", "gemini-3.0-flash"]
 
+    @cached_chat
     async def chat(
         self,
         messages: list[dict],
@@ -43,16 +88,15 @@ class GeminiLLM(BaseLLM):
         if not self._client:
             return "[Gemini] API key not configured. Set GEMINI_API_KEY env var."
         try:
-            prompt = "\n".join(
-                f"{m['role'].upper()}: {m['content']}" for m in messages
-            )
+            system_instruction, contents = _to_contents(messages)
             config = genai_types.GenerateContentConfig(
                 temperature=temperature,
                 max_output_tokens=max_tokens,
+                system_instruction=system_instruction,
             )
-            resp = self._client.models.generate_content(
+            resp = await self._client.aio.models.generate_content(
                 model=self.model,
-                contents=prompt,
+                contents=contents,
                 config=config,
             )
             return resp.text
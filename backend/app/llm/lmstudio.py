@@ -4,9 +4,11 @@ LM Studio exposes an OpenAI-compatible API at http://localhost:1234/v1.
 No API key required  local only.
 """
 
-import httpx
+import orjson
 import os
+from ._http import get_client
 from .base import BaseLLM
+from .cache import cached_chat
 
 LMSTUDIO_BASE = os.getenv("LMSTUDIO_BASE_URL", "http://localhost:1234")
 
@@ -22,14 +24,14 @@ class LMStudioLLM(BaseLLM):
 
     async def list_models(self) -> list[str]:
         try:
-            async with httpx.AsyncClient(timeout=3.0) as client:
-                resp = await client.get(f"{self.base_url}/v1/models")
-                resp.raise_for_status()
-                data = resp.json()
-                return [m["id"] for m in data.get("data", [])]
+            resp = await get_client().get(f"{self.base_url}/v1/models", timeout=3.0)
+            resp.raise_for_status()
+            data = orjson.loads(resp.content)
+            return [m["id"] for m in data.get("data", [])]
         except Exception:
             return []
 
+    @cached_chat
     async def chat(
         self,
         messages: list[dict],
@@ -43,15 +45,15 @@ class LMStudioLLM(BaseLLM):
             "max_tokens": max_tokens,
             "stream": False,
         }
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            resp = await client.post(
-                f"{self.base_url}/v1/chat/completions",
-                json=payload,
-                headers={"Content-Type": "application/json"},
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            choices = data.get("choices", [])
-            if not choices:
-                return ""
-            return choices[0].get("message", {}).get("content", "")
+        resp = await get_client().post(
+            f"{self.base_url}/v1/chat/completions",
+            json=payload,
+            headers={"Content-Type": "application/json"},
+            timeout=120.0,
+        )
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
+        choices = data.get("choices", [])
+        if not choices:
+            return ""
+        return choices[0].get("message", {}).get("content", "")
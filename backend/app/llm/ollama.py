@@ -1,10 +1,25 @@
-import httpx
+import orjson
 import os
+from ._http import get_client
 from .base import BaseLLM
+from .cache import cached_chat
 
 OLLAMA_BASE = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 
 
+async def _iter_lines(resp):
+    """Yield raw NDJSON lines as bytes, without decoding them to str."""
+    buf = b""
+    async for raw in resp.aiter_bytes():
+        buf += raw
+        *lines, buf = buf.split(b"\n")
+        for line in lines:
+            if line:
+                yield line
+    if buf.strip():
+        yield buf
+
+
 class OllamaLLM(BaseLLM):
     def __init__(self, model: str = "llama3"):
         self.model = model
@@ -15,14 +30,14 @@ class OllamaLLM(BaseLLM):
 
     async def list_models(self) -> list[str]:
         try:
-            async with httpx.AsyncClient(timeout=3.0) as client:
-                resp = await client.get(f"{OLLAMA_BASE}/api/tags")
-                resp.raise_for_status()
-                data = resp.json()
-                return [m["name"] for m in data.get("models", [])]
+            resp = await get_client().get(f"{OLLAMA_BASE}/api/tags", timeout=3.0)
+            resp.raise_for_status()
+            data = orjson.loads(resp.content)
+            return [m["name"] for m in data.get("models", [])]
         except Exception:
             return []
 
+    @cached_chat
     async def chat(
         self,
         messages: list[dict],
@@ -42,11 +57,10 @@ class OllamaLLM(BaseLLM):
                 "num_ctx": 16384,
             },
         }
-        async with httpx.AsyncClient(timeout=180.0) as client:
-            resp = await client.post(f"{OLLAMA_BASE}/api/chat", json=payload)
-            resp.raise_for_status()
-            data = resp.json()
-            return data.get("message", {}).get("content", "")
+        resp = await get_client().post(f"{OLLAMA_BASE}/api/chat", json=payload, timeout=180.0)
+        resp.raise_for_status()
+        data = orjson.loads(resp.content)
+        return data.get("message", {}).get("content", "")
 
     async def chat_stream(
         self,
@@ -65,16 +79,19 @@ class OllamaLLM(BaseLLM):
                 "num_ctx": 16384,
             },
         }
-        import json
-        async with httpx.AsyncClient(timeout=120.0) as client:
-            async with client.stream("POST", f"{OLLAMA_BASE}/api/chat", json=payload) as resp:
-                resp.raise_for_status()
-                async for line in resp.aiter_lines():
-                    if line.strip():
-                        try:
-                            chunk = json.loads(line)
-                            content = chunk.get("message", {}).get("content", "")
-                            if content:
-                                yield content
-                        except Exception:
-                            pass
+        client = get_client()
+        async with client.stream("POST", f"{OLLAMA_BASE}/api/chat", json=payload) as resp:
+            resp.raise_for_status()
+            async for line in _iter_lines(resp):
+                # Skip keepalive/stats frames without decoding them
+                if b'"content"' not in line:
+                    continue
+                try:
+                    chunk = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue
+                content = chunk.get("message", {}).get("content", "")
+                if content:
+                    yield content
+                if chunk.get("done"):
+                    break
@@ -1,6 +1,9 @@
 import os
+import time
 from typing import AsyncGenerator
+from ._http import get_client
 from .base import BaseLLM
+from .cache import cached_chat
 
 try:
     from openai import AsyncOpenAI
@@ -8,13 +11,32 @@ try:
 except ImportError:
     _openai_available = False
 
+# How long a fetched model list is reused before asking the API again
+MODELS_TTL = 300.0
+
 
 class OpenAILLM(BaseLLM):
     def __init__(self, model: str = "gpt-4o", api_key: str | None = None):
         self.model = model
         # Use provided key, otherwise fall back to environment variable
         api_key = api_key or os.getenv("OPENAI_API_KEY", "")
-        self._client = AsyncOpenAI(api_key=api_key) if _openai_available and api_key else None
+        self._api_key = api_key if _openai_available else ""
+        self._sdk = None
+        self._sdk_http = None
+        # list_models memo: (fetched_at, models)
+        self._models_ts: float = 0.0
+        self._models_val: list[str] | None = None
+
+    @property
+    def _client(self):
+        """AsyncOpenAI built on first use over the shared pooled httpx client, or None without a key."""
+        if not self._api_key:
+            return None
+        http = get_client()
+        if self._sdk is None or self._sdk_http is not http:
+            self._sdk = AsyncOpenAI(api_key=self._api_key, http_client=http)
+            self._sdk_http = http
+        return self._sdk
 
     @property
     def provider_name(self) -> str:
@@ -23,13 +45,18 @@ class OpenAILLM(BaseLLM):
     async def list_models(self) -> list[str]:
         if not self._client:
             return ["gpt-4o", "gpt-4-turbo", "gpt-3.5-turbo"]
+        now = time.monotonic()
+        if self._models_val is not None and now - self._models_ts < MODELS_TTL:
+            return self._models_val
         try:
             models = await self._client.models.list()
-            gpt = [m.id for m in models.data if m.id.startswith("gpt")]
-            return sorted(gpt)
+            self._models_val = sorted(m.id for m in models.data if m.id.startswith("gpt"))
+            self._models_ts = now
+            return self._models_val
         except Exception:
             return ["gpt-4o", "gpt-4-turbo", "gpt-3.5-turbo"]
 
+    @cached_chat
     async def chat(
         self,
         messages: list[dict],
@@ -7,6 +7,11 @@ Examples:
   get_llm("lmstudio:my-model")      LMStudioLLM("my-model")
 """
 
+import asyncio
+import functools
+import time
+from typing import Awaitable, Callable
+
 from .base import BaseLLM
 from .ollama import OllamaLLM
 from .openai import OpenAILLM
@@ -14,40 +19,69 @@ from .gemini import GeminiLLM
 from .lmstudio import LMStudioLLM
 
 
+# provider prefix  factory(model, api_key)
+_PROVIDERS: dict[str, Callable[[str, str | None], BaseLLM]] = {
+    "ollama":   lambda model, api_key: OllamaLLM(model),
+    "openai":   lambda model, api_key: OpenAILLM(model, api_key=api_key),
+    "gemini":   lambda model, api_key: GeminiLLM(model, api_key=api_key),
+    "google":   lambda model, api_key: GeminiLLM(model, api_key=api_key),
+    "lmstudio": lambda model, api_key: LMStudioLLM(model),
+}
+_DEFAULT_PROVIDER = _PROVIDERS["ollama"]
+
+
+@functools.lru_cache(maxsize=128)
 def get_llm(model_string: str, api_key: str | None = None) -> BaseLLM:
-    """Parse 'provider:model' and return the appropriate LLM instance."""
-    if ":" in model_string:
-        provider, model = model_string.split(":", 1)
-    else:
+    """
+    Parse 'provider:model' and return the appropriate LLM instance.
+    Instances are stateless between calls, so one is reused per
+    (model_string, api_key) instead of rebuilding SDK clients per node.
+    """
+    provider, sep, model = model_string.partition(":")
+    if not sep:
         provider, model = "ollama", model_string
+    # Unknown providers default to Ollama
+    return _PROVIDERS.get(provider.lower(), _DEFAULT_PROVIDER)(model, api_key)
+
+
+# Per-provider model lists, reused for _CACHE_TTL seconds so frequent
+# /models polls from the UI don't hit every provider API each time.
+_CACHE_TTL = 30.0
+_models_cache: dict[str, tuple[float, list[str]]] = {}
+_models_locks: dict[str, asyncio.Lock] = {}
 
-    provider = provider.lower()
-    if provider == "ollama":
-        return OllamaLLM(model)
-    elif provider == "openai":
-        return OpenAILLM(model, api_key=api_key)
-    elif provider in ("gemini", "google"):
-        return GeminiLLM(model, api_key=api_key)
-    elif provider == "lmstudio":
-        return LMStudioLLM(model)
-    else:
-        # Default to Ollama
-        return OllamaLLM(model)
+
+async def _cached(name: str, fetch: Callable[[], Awaitable[list[str]]]) -> list[str]:
+    """Return the cached model list for a provider, fetching it on expiry.
+    Concurrent misses for the same provider share a single upstream call."""
+    hit = _models_cache.get(name)
+    if hit and time.monotonic() - hit[0] < _CACHE_TTL:
+        return hit[1]
+    lock = _models_locks.setdefault(name, asyncio.Lock())
+    async with lock:
+        hit = _models_cache.get(name)
+        if hit and time.monotonic() - hit[0] < _CACHE_TTL:
+            return hit[1]
+        models = await fetch()
+        _models_cache[name] = (time.monotonic(), models)
+        return models
+
+
+# Default-configured provider instances reused by get_all_models, so the
+# OpenAI/Gemini SDK clients and their list_models memos survive across calls.
+_ollama   = OllamaLLM()
+_openai   = OpenAILLM()
+_gemini   = GeminiLLM()
+_lmstudio = LMStudioLLM()
 
 
 async def get_all_models() -> dict[str, list[str]]:
     """Fetch available models from all providers concurrently."""
-    import asyncio
-    ollama = OllamaLLM()
-    openai_llm = OpenAILLM()
-    gemini_llm = GeminiLLM()
-    lmstudio_llm = LMStudioLLM()
-
     ollama_models, openai_models, gemini_models, lmstudio_models = await asyncio.gather(
-        ollama.list_models(),
-        openai_llm.list_models(),
-        gemini_llm.list_models(),
-        lmstudio_llm.list_models(),
+        _cached("ollama",   _ollama.list_models),
+        _cached("openai",   _openai.list_models),
+        _cached("gemini",   _gemini.list_models),
+        _cached("lmstudio", _lmstudio.list_models),
         return_exceptions=True,
     )
 
@@ -0,0 +1,172 @@
+"""
+Semantic LLM cache  second tier behind the exact-match cache in cache.py.
+
+The final user message is embedded with a local Ollama embedding model and
+compared against earlier prompts in the same partition
+(provider, model, temperature, system prompt, earlier turns). A match at or above
+SEMANTIC_THRESHOLD cosine similarity returns the stored response.
+
+Opt-in via AGENTFORGE_SEMANTIC_CACHE=1. Uses faiss.IndexFlatIP when installed,
+otherwise a plain Python cosine scan. Flows containing side-effecting nodes
+(tool, shell, file system, Power BI) switch it off for their execution via
+allow_semantic_cache().
+"""
+
+import hashlib
+import math
+import os
+from contextvars import ContextVar
+
+import orjson
+
+from ._http import get_client
+
+try:
+    import faiss
+    import numpy as np
+    _faiss_available = True
+except ImportError:
+    _faiss_available = False
+
+SEMANTIC_ENABLED = os.getenv("AGENTFORGE_SEMANTIC_CACHE", "").lower() in ("1", "true", "yes")
+EMBED_MODEL = os.getenv("AGENTFORGE_EMBED_MODEL", "nomic-embed-text")
+SEMANTIC_THRESHOLD = float(os.getenv("AGENTFORGE_SEMANTIC_THRESHOLD", "0.95"))
+MAX_ENTRIES = 1000   # per partition
+OLLAMA_BASE = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+
+# Set per execution by executor.execute(); child tasks inherit it
+_allowed: ContextVar[bool] = ContextVar("semantic_cache_allowed", default=True)
+
+
+def allow_semantic_cache(allowed: bool) -> None:
+    """Enable/disable the semantic tier for the current execution context."""
+    _allowed.set(allowed)
+
+
+def _normalize(vec: list[float]) -> list[float] | None:
+    norm = math.sqrt(sum(v * v for v in vec))
+    if not norm:
+        return None
+    return [v / norm for v in vec]
+
+
+class _Partition:
+    """Normalized prompt embeddings and their responses for one partition."""
+
+    def __init__(self):
+        self.vectors: list[list[float]] = []
+        self.responses: list[str] = []
+        self._index = None
+
+    def _rebuild(self) -> None:
+        self._index = None
+        if _faiss_available and self.vectors:
+            self._index = faiss.IndexFlatIP(len(self.vectors[0]))
+            self._index.add(np.asarray(self.vectors, dtype="float32"))
+
+    def search(self, vec: list[float]) -> tuple[float, str | None]:
+        if not self.vectors:
+            return 0.0, None
+        if _faiss_available:
+            if self._index is None:
+                self._rebuild()
+            scores, ids = self._index.search(np.asarray([vec], dtype="float32"), 1)
+            best, idx = float(scores[0][0]), int(ids[0][0])
+        else:
+            best, idx = max(
+                (sum(a * b for a, b in zip(vec, v)), i) for i, v in enumerate(self.vectors)
+            )
+        return best, self.responses[idx]
+
+    def add(self, vec: list[float], response: str) -> None:
+        self.vectors.append(vec)
+        self.responses.append(response)
+        if len(self.vectors) > MAX_ENTRIES:
+            # Drop the oldest half and rebuild rather than evicting one by one
+            keep = MAX_ENTRIES // 2
+            self.vectors = self.vectors[-keep:]
+            self.responses = self.responses[-keep:]
+            self._rebuild()
+        elif self._index is not None:
+            self._index.add(np.asarray([vec], dtype="float32"))
+
+
+class SemanticCache:
+    def __init__(self, threshold: float = SEMANTIC_THRESHOLD):
+        self.threshold = threshold
+        self._parts: dict[tuple, _Partition] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def enabled(self) -> bool:
+        return SEMANTIC_ENABLED and _allowed.get()
+
+    @staticmethod
+    def _partition_key(provider: str, model: str, temperature: float,
+                       messages: list[dict]) -> tuple:
+        system = "\n".join(
+            m["content"] for m in messages
+            if m.get("role") == "system" and isinstance(m.get("content"), str)
+        )
+        # Earlier turns are matched exactly; only the final message is compared
+        # semantically, so "continue" in two conversations never collides
+        history = orjson.dumps(
+            [m for m in messages[:-1] if m.get("role") != "system"],
+            option=orjson.OPT_SORT_KEYS,
+        )
+        return (provider, model, temperature,
+                hashlib.sha256(system.encode()).hexdigest(),
+                hashlib.sha256(history).hexdigest())
+
+    async def _embed(self, text: str) -> list[float] | None:
+        try:
+            resp = await get_client().post(
+                f"{OLLAMA_BASE}/api/embeddings",
+                json={"model": EMBED_MODEL, "prompt": text},
+                timeout=10.0,
+            )
+            resp.raise_for_status()
+            return _normalize(orjson.loads(resp.content).get("embedding") or [])
+        except Exception:
+            return None
+
+    async def lookup(self, provider: str, model: str, temperature: float,
+                     messages: list[dict]) -> tuple[str | None, tuple | None]:
+        """
+        Return (cached_response, probe). probe is passed back to store() on a
+        miss; it is None when the request can't be cached (no text prompt or
+        embedding unavailable).
+        """
+        prompt = messages[-1].get("content") if messages else None
+        if not isinstance(prompt, str) or not prompt.strip():
+            return None, None
+        vec = await self._embed(prompt)
+        if vec is None:
+            return None, None
+
+        key = self._partition_key(provider, model, temperature, messages)
+        part = self._parts.get(key)
+        if part is not None:
+            score, response = part.search(vec)
+            if response is not None and score >= self.threshold:
+                self.hits += 1
+                return response, None
+        self.misses += 1
+        return None, (key, vec)
+
+    def store(self, probe: tuple, response: str) -> None:
+        key, vec = probe
+        self._parts.setdefault(key, _Partition()).add(vec, response)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "enabled": SEMANTIC_ENABLED,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "entries": sum(len(p.vectors) for p in self._parts.values()),
+        }
+
+
+semantic_cache = SemanticCache()
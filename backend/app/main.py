@@ -1,6 +1,7 @@
 """AgentForge Backend  FastAPI Application Entry Point"""
 
 import os
+import orjson
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from fastapi import FastAPI
@@ -11,33 +12,40 @@ load_dotenv()
 
 # Import routers
 from app.routes import flow, execute, models, knowledge, tools, chat, webhook, deploy
-from app.routes import agent_tasks, runs, media, schedules, stats
+from app.routes import agent_tasks, runs, media, schedules, stats, batch
 from app.services import background_agent as bg_svc
-from app.services import deploy_store, run_store, schedule_store
+from app.services import deploy_store, run_store, schedule_store, task_store
 from app.services import scheduler as scheduler_svc
+from app.utils.orjson_response import ORJSONResponse
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Startup/shutdown logic."""
     import asyncio
-    import httpx
+    from app.llm._http import get_client, close_client
+    from app.services import http_client
     ollama_base = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434").rstrip("/")
     print(" AgentForge backend starting")
-    try:
-        async with httpx.AsyncClient(timeout=2.0) as client:
-            resp = await client.get(f"{ollama_base}/api/tags")
+
+    async def _probe_ollama():
+        try:
+            resp = await get_client().get(f"{ollama_base}/api/tags", timeout=2.0)
             if resp.status_code == 200:
-                data = resp.json()
+                data = orjson.loads(resp.content)
                 model_names = [m["name"] for m in data.get("models", [])]
                 print(f" Ollama connected  models: {', '.join(model_names) or 'none installed'}")
-    except Exception:
-        print("  Ollama not running  start with: ollama serve")
+        except Exception:
+            print("  Ollama not running  start with: ollama serve")
+
+    # Fire-and-forget so a missing Ollama doesn't delay readiness
+    probe_task = asyncio.create_task(_probe_ollama())
 
     # Init SQLite DBs
     deploy_store.init_db()
     run_store.init_db()
     schedule_store.init_db()
+    task_store.init_db()
 
     # Start background workers
     worker_task = asyncio.create_task(bg_svc.worker_loop())
@@ -46,12 +54,14 @@ async def lifespan(app: FastAPI):
     yield
 
     # Cancel workers on shutdown
-    for task in (worker_task, scheduler_task):
+    for task in (probe_task, worker_task, scheduler_task):
         task.cancel()
         try:
             await task
         except asyncio.CancelledError:
             pass
+    await close_client()
+    await http_client.close_client()
     print(" AgentForge backend shutting down.")
 
 
@@ -60,6 +70,7 @@ app = FastAPI(
     description="Local-first AI agent workflow backend",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS  allow React dev server and any local origin
@@ -75,6 +86,7 @@ app.add_middleware(
 app.include_router(flow.router,         tags=["Flow"])
 app.include_router(execute.router,      tags=["Execute"])
 app.include_router(chat.router,         tags=["Chat"])
+app.include_router(batch.router,        tags=["Chat"])
 app.include_router(models.router,       tags=["Models"])
 app.include_router(knowledge.router,    tags=["Knowledge"])
 app.include_router(tools.router,        tags=["Tools"])
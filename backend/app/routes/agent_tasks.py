@@ -6,6 +6,8 @@ GET    /agent-tasks/{id}      get task status + result
 DELETE /agent-tasks/{id}      remove a task
 """
 
+import asyncio
+
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
@@ -27,7 +29,10 @@ class SubmitTaskResponse(BaseModel):
 @router.post("", response_model=SubmitTaskResponse, status_code=202)
 async def submit_task(body: SubmitTaskRequest):
     """Enqueue a flow for background execution. Returns task_id immediately."""
-    task_id = await bg_svc.submit_task(body.flow, body.userInput)
+    try:
+        task_id = await bg_svc.submit_task(body.flow, body.userInput)
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=503, detail="Background task queue is full, retry later.")
     return SubmitTaskResponse(task_id=task_id)
 
 
@@ -0,0 +1,42 @@
+"""
+Batch chat route  POST /chat/batch
+Sends many independent prompts to one model concurrently and returns the
+replies in input order.
+"""
+
+from typing import Optional
+
+from fastapi import APIRouter
+from pydantic import BaseModel, Field
+
+from app.llm.registry import get_llm
+
+router = APIRouter()
+
+
+class BatchChatRequest(BaseModel):
+    batch:       list[list[dict]]
+    model:       str = "ollama:llama3:8b"
+    apiKey:      Optional[str] = None
+    temperature: float = Field(default=0.7, ge=0.0, le=1.0)
+    maxTokens:   int = Field(default=2048, ge=64, le=32000)
+    concurrency: int = Field(default=10, ge=1, le=50)
+
+
+@router.post("/chat/batch")
+async def chat_batch(req: BatchChatRequest):
+    """Run every message list in `batch` against the model, in parallel."""
+    llm = get_llm(req.model, api_key=req.apiKey)
+    results = await llm.abatch(
+        req.batch,
+        temperature=req.temperature,
+        max_tokens=req.maxTokens,
+        concurrency=req.concurrency,
+    )
+    return {
+        "model": req.model,
+        "results": [
+            {"error": str(r)} if isinstance(r, BaseException) else {"output": r}
+            for r in results
+        ],
+    }
@@ -4,13 +4,13 @@ Runs the active flow with the user's message and streams a clean
 response event containing only the final output node's text.
 """
 
-import json
 from fastapi import APIRouter
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from app.services.executor import execute
+from app.utils.sse import DONE_FRAME, sse_event
 from app.services import memory as mem_svc
-from app.models.schema import FlowGraph
+from app.models.schema import FlowGraph, NodeType
 
 router = APIRouter()
 
@@ -22,12 +22,9 @@ class ChatRequest(BaseModel):
     sessionId: str = "default"
 
 
-def _is_output_node(node_id: str, flow: FlowGraph) -> bool:
-    """Return True if the given node has nodeType == 'output'."""
-    for node in flow.nodes:
-        if node.id == node_id:
-            return node.data.nodeType.value == "output"
-    return False
+def _output_node_ids(flow: FlowGraph) -> frozenset[str]:
+    """Return the ids of all nodes with nodeType == 'output'."""
+    return frozenset(n.id for n in flow.nodes if n.data.nodeType is NodeType.output)
 
 
 def _flow_uses_memory(flow: FlowGraph) -> bool:
@@ -44,6 +41,7 @@ async def chat_route(req: ChatRequest):
     async def event_stream():
         output_response = ""
         last_ok_output  = ""
+        output_ids      = _output_node_ids(req.flow)
 
         try:
             async for event in execute(
@@ -52,7 +50,7 @@ async def chat_route(req: ChatRequest):
                 model=req.model,
                 session_id=req.sessionId,
             ):
-                yield f"data: {json.dumps(event)}\n\n"
+                yield sse_event(event)
 
                 if event.get("type") == "ok" and event.get("nodeId"):
                     # Prefer event.data.output  always the real text
@@ -64,23 +62,22 @@ async def chat_route(req: ChatRequest):
                     if content.strip():
                         last_ok_output = content
 
-                    node_id = event["nodeId"]
-                    if _is_output_node(node_id, req.flow):
+                    if event["nodeId"] in output_ids:
                         output_response = content
 
         except Exception as exc:
-            err_event = {"type": "err", "message": f"Execution error: {exc}"}
-            yield f"data: {json.dumps(err_event)}\n\n"
-            yield f"data: {json.dumps({'type': 'response', 'message': str(exc)})}\n\n"
-            yield "data: [DONE]\n\n"
+            message = str(exc)
+            yield sse_event({"type": "err", "message": f"Execution error: {message}"})
+            yield sse_event({"type": "response", "message": message})
+            yield DONE_FRAME
             return
 
         response_text = output_response or last_ok_output or "(No output produced)"
         if _flow_uses_memory(req.flow):
             mem_svc.store_short(req.sessionId, "user", req.message)
             mem_svc.store_short(req.sessionId, "assistant", response_text)
-        yield f"data: {json.dumps({'type': 'response', 'message': response_text})}\n\n"
-        yield "data: [DONE]\n\n"
+        yield sse_event({"type": "response", "message": response_text})
+        yield DONE_FRAME
 
     return StreamingResponse(
         event_stream(),
@@ -8,13 +8,13 @@ POST /api/{slug}     invoke endpoint (sync JSON)
 POST /api/{slug}/stream  invoke endpoint (SSE)
 """
 
-import json
 import re
 from fastapi import APIRouter, HTTPException, Request, Depends, Header
 from fastapi.responses import JSONResponse, StreamingResponse
-from app.models.schema import DeployRequest, DeployedAPI, DeployInvokeRequest
+from app.models.schema import DeployRequest, DeployedAPI, DeployInvokeRequest, NodeType
 from app.services import deploy_store
 from app.services.executor import execute
+from app.utils.sse import DONE_FRAME, sse_event
 
 router = APIRouter()
 
@@ -99,6 +99,7 @@ async def invoke_api(
     
     output = ""
     last_ok = ""
+    output_ids = frozenset(n.id for n in flow.nodes if n.data.nodeType is NodeType.output)
     try:
         async for event in execute(
             graph=flow,
@@ -110,9 +111,8 @@ async def invoke_api(
                 content = (event.get("data") or {}).get("output", "")
                 if content and content.strip():
                     last_ok = content
-                    for node in flow.nodes:
-                        if node.id == event["nodeId"] and node.data.nodeType.value == "output":
-                            output = content
+                    if event["nodeId"] in output_ids:
+                        output = content
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Execution error: {exc}")
 
@@ -139,8 +139,8 @@ async def invoke_api_stream(
             model=model,
             session_id=slug,
         ):
-            yield f"data: {json.dumps(log_event)}\n\n"
-        yield "data: [DONE]\n\n"
+            yield sse_event(log_event)
+        yield DONE_FRAME
 
     return StreamingResponse(
         event_stream(),
@@ -1,8 +1,8 @@
-import json
 from fastapi import APIRouter
 from fastapi.responses import StreamingResponse
 from app.models.schema import ExecuteRequest
 from app.services.executor import execute
+from app.utils.sse import DONE_FRAME, sse_event
 
 router = APIRouter()
 
@@ -20,8 +20,8 @@ async def execute_route(req: ExecuteRequest):
             model=req.model,
             session_id=req.sessionId,
         ):
-            yield f"data: {json.dumps(log_event)}\n\n"
-        yield "data: [DONE]\n\n"
+            yield sse_event(log_event)
+        yield DONE_FRAME
 
     return StreamingResponse(
         event_stream(),
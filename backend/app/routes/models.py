@@ -1,6 +1,8 @@
 from fastapi import APIRouter
 from app.models.schema import ModelsResponse
 from app.llm.registry import get_all_models
+from app.llm.cache import llm_cache
+from app.llm.semantic_cache import semantic_cache
 
 router = APIRouter()
 
@@ -9,3 +11,9 @@ router = APIRouter()
 async def get_models():
     """Return available models from all configured providers."""
     return await get_all_models()
+
+
+@router.get("/models/cache-stats")
+async def get_cache_stats():
+    """Hit/miss counters for the exact-match and semantic LLM response caches."""
+    return {**llm_cache.stats(), "semantic": semantic_cache.stats()}
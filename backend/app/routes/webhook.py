@@ -8,7 +8,7 @@ import json
 import uuid
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import JSONResponse
-from app.models.schema import WebhookRegisterRequest, FlowGraph
+from app.models.schema import WebhookRegisterRequest, FlowGraph, NodeType
 from app.services.executor import execute
 
 router = APIRouter(prefix="/webhook")
@@ -62,6 +62,7 @@ async def trigger_webhook(webhook_id: str, request: Request):
     # Run to completion, collect final output
     output = ""
     last_ok = ""
+    output_ids = frozenset(n.id for n in flow.nodes if n.data.nodeType is NodeType.output)
     try:
         async for event in execute(
             graph=flow,
@@ -73,10 +74,8 @@ async def trigger_webhook(webhook_id: str, request: Request):
                 content = (event.get("data") or {}).get("output", "")
                 if content and content.strip():
                     last_ok = content
-                    # Check if this is an output node
-                    for node in flow.nodes:
-                        if node.id == event["nodeId"] and node.data.nodeType.value == "output":
-                            output = content
+                    if event["nodeId"] in output_ids:
+                        output = content
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Execution error: {exc}")
 
@@ -33,7 +33,8 @@ def _extract_image_data_url(text: str) -> str | None:
 
 
 def _build_messages(node: Node, user_input: str, node_outputs: dict, session_id: str,
-                    context: str | None, model_override: str | None) -> tuple[list[dict], object]:
+                    context: str | None, model_override: str | None,
+                    knowledge_cache: dict | None = None) -> tuple[list[dict], object]:
     """Build the message list and llm instance shared by run_agent and run_agent_stream."""
     data = node.data
     model_str = model_override or data.model or "ollama:llama3:8b"
@@ -42,7 +43,9 @@ def _build_messages(node: Node, user_input: str, node_outputs: dict, session_id:
     if context is None:
         context = "\n\n".join(node_outputs.values()) or user_input
 
-    knowledge_ctx = know_svc.context_for(user_input, top_k=3) if user_input else ""
+    knowledge_ctx = (
+        know_svc.context_for(user_input, top_k=3, cache=knowledge_cache) if user_input else ""
+    )
 
     system_content = data.systemPrompt or (
         f"You are a helpful {data.label} assistant. "
@@ -86,10 +89,12 @@ async def run_agent(
     model_override: str | None = None,
     context: str | None = None,
     persist_memory: bool = True,
+    knowledge_cache: dict | None = None,
 ) -> str:
     """Execute an agent node and return its output string."""
     data = node.data
-    messages, llm = _build_messages(node, user_input, node_outputs, session_id, context, model_override)
+    messages, llm = _build_messages(node, user_input, node_outputs, session_id, context,
+                                    model_override, knowledge_cache)
 
     response = await llm.chat(
         messages,
@@ -112,13 +117,15 @@ async def run_agent_stream(
     model_override: str | None = None,
     context: str | None = None,
     persist_memory: bool = True,
+    knowledge_cache: dict | None = None,
 ):
     """
     Async generator that streams text chunks from the LLM.
     Yields str chunks. Stores the full response in memory when done.
     """
     data = node.data
-    messages, llm = _build_messages(node, user_input, node_outputs, session_id, context, model_override)
+    messages, llm = _build_messages(node, user_input, node_outputs, session_id, context,
+                                    model_override, knowledge_cache)
 
     full_response = []
     async for chunk in llm.chat_stream(
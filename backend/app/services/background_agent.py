@@ -3,56 +3,105 @@ Background Agent Service
 Persistent in-memory task queue using asyncio.Queue.
 Tasks run the same execute() generator as normal flow execution
 and store aggregated log output as the result.
+The in-memory store is an LRU capped at MAX_IN_MEMORY_TASKS; finished tasks
+evicted from it are kept in task_store (SQLite).
 """
 
 from __future__ import annotations
 import asyncio
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timezone
 from typing import Optional
 
 from app.models.schema import BackgroundTask, FlowGraph, TaskStatus
+from app.services import task_store
+
+MAX_IN_MEMORY_TASKS = 500
+SUBMIT_TIMEOUT = 2.0     # seconds to wait for queue space before rejecting
+LIST_LIMIT = 100         # persisted tasks returned by list_tasks()
+
+_FINISHED = (TaskStatus.done, TaskStatus.error)
 
 #  In-memory store 
+# Status fields change on every transition, so they live in plain dicts; the
+# FlowGraph payload is stored once. BackgroundTask models are only built when
+# handed out, via model_construct (fields were validated on submit).
 
-_tasks: dict[str, BackgroundTask] = {}
+_tasks_meta: OrderedDict[str, dict] = OrderedDict()
+_tasks_flow: dict[str, FlowGraph] = {}
 _queue: asyncio.Queue[str] = asyncio.Queue(maxsize=100)
 
+
+def _build(task_id: str) -> BackgroundTask:
+    return BackgroundTask.model_construct(
+        task_id=task_id, flow=_tasks_flow[task_id], **_tasks_meta[task_id],
+    )
+
+
+def _drop(task_id: str) -> None:
+    del _tasks_meta[task_id]
+    del _tasks_flow[task_id]
+
+
+def _evict() -> None:
+    """Spill the least recently used finished tasks to SQLite."""
+    while len(_tasks_meta) > MAX_IN_MEMORY_TASKS:
+        victim = next(
+            (tid for tid, meta in _tasks_meta.items() if meta["status"] in _FINISHED), None
+        )
+        if victim is None:
+            return   # only pending/running tasks left; those stay in memory
+        task_store.save_task(_build(victim))
+        _drop(victim)
+
+
 #  Public API 
 
 
 async def submit_task(flow: FlowGraph, user_input: str) -> str:
-    """Enqueue a new background task. Returns the task_id."""
+    """
+    Enqueue a new background task. Returns the task_id.
+    Raises asyncio.QueueFull if the queue stays full for SUBMIT_TIMEOUT.
+    """
     task_id = str(uuid.uuid4())
-    task = BackgroundTask(
-        task_id=task_id,
-        status=TaskStatus.pending,
-        result=None,
-        created_at=datetime.now(timezone.utc).isoformat(),
-        flow=flow,
-        user_input=user_input,
-    )
-    _tasks[task_id] = task
-    await _queue.put(task_id)
+    _tasks_meta[task_id] = {
+        "status": TaskStatus.pending,
+        "result": None,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "user_input": user_input,
+    }
+    _tasks_flow[task_id] = flow
+    try:
+        await asyncio.wait_for(_queue.put(task_id), timeout=SUBMIT_TIMEOUT)
+    except asyncio.TimeoutError:
+        _drop(task_id)
+        raise asyncio.QueueFull from None
+    _evict()
     return task_id
 
 
 def get_task(task_id: str) -> Optional[BackgroundTask]:
     """Return task by ID, or None if not found."""
-    return _tasks.get(task_id)
+    if task_id in _tasks_meta:
+        _tasks_meta.move_to_end(task_id)
+        return _build(task_id)
+    return task_store.get_task(task_id)
 
 
 def list_tasks() -> list[BackgroundTask]:
-    """Return all tasks, newest first."""
-    return sorted(_tasks.values(), key=lambda t: t.created_at, reverse=True)
+    """Return in-memory tasks plus the newest persisted ones, newest first."""
+    persisted = [t for t in task_store.list_tasks(LIST_LIMIT) if t.task_id not in _tasks_meta]
+    in_memory = [_build(tid) for tid in _tasks_meta]
+    return sorted([*in_memory, *persisted], key=lambda t: t.created_at, reverse=True)
 
 
 def delete_task(task_id: str) -> bool:
     """Remove a task from the store. Returns True if it existed."""
-    if task_id in _tasks:
-        del _tasks[task_id]
+    if task_id in _tasks_meta:
+        _drop(task_id)
         return True
-    return False
+    return task_store.delete_task(task_id)
 
 
 #  Worker loop 
@@ -69,19 +118,19 @@ async def worker_loop() -> None:
     print(" Background agent worker started.")
     while True:
         task_id = await _queue.get()
-        task = _tasks.get(task_id)
-        if task is None:
+        meta = _tasks_meta.get(task_id)
+        if meta is None:
             _queue.task_done()
             continue
 
         # Mark running
-        _tasks[task_id] = task.model_copy(update={"status": TaskStatus.running})
+        meta["status"] = TaskStatus.running
 
         log_lines: list[str] = []
         try:
             async for event in execute(
-                graph=task.flow,
-                user_input=task.user_input,
+                graph=_tasks_flow[task_id],
+                user_input=meta["user_input"],
                 model="ollama:llama3:8b",
                 session_id=f"bg-{task_id}",
             ):
@@ -89,13 +138,10 @@ async def worker_loop() -> None:
                 if msg:
                     log_lines.append(msg)
 
-            aggregated = "\n".join(log_lines)
-            _tasks[task_id] = _tasks[task_id].model_copy(
-                update={"status": TaskStatus.done, "result": aggregated}
-            )
+            meta["result"] = "\n".join(log_lines)
+            meta["status"] = TaskStatus.done
         except Exception as exc:
-            _tasks[task_id] = _tasks[task_id].model_copy(
-                update={"status": TaskStatus.error, "result": f"Error: {exc}"}
-            )
+            meta["result"] = f"Error: {exc}"
+            meta["status"] = TaskStatus.error
         finally:
             _queue.task_done()
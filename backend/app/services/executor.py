@@ -13,7 +13,7 @@ import json
 import re
 import time
 import uuid
-from collections import defaultdict, deque
+from collections import OrderedDict, defaultdict, deque
 from datetime import datetime
 
 from app.models.schema import FlowGraph, NodeType, LogEvent, LogType
@@ -27,13 +27,25 @@ from app.services import cost_tracker as ct
 from app.services import run_store
 from app.services import media_processor
 from app.llm.registry import get_llm
+from app.llm.semantic_cache import allow_semantic_cache
 
 # Node types that incur LLM cost
 _LLM_NODE_TYPES = {NodeType.agent, NodeType.output, NodeType.debate, NodeType.evaluator}
 
+# Node types with side effects  flows containing them bypass the semantic LLM cache
+_SIDE_EFFECT_NODE_TYPES = {NodeType.tool, NodeType.shell_exec, NodeType.file_system, NodeType.powerbi}
+
+# Node types that write the shared variables dict  their layer runs sequentially
+_VARIABLE_WRITERS = {NodeType.set_variable, NodeType.loop}
+
 # Sentinel used to mark a node whose branch was not taken
 _SKIPPED = "__SKIPPED__"
 
+# (order, feeds) of recently executed graphs, keyed by node/edge structure.
+# feeds maps a node id to the ids of its direct sources.
+_TOPO_CACHE_SIZE = 128
+_topo_cache: OrderedDict[tuple, tuple[list[str], dict[str, list[str]]]] = OrderedDict()
+
 
 def _log(type: LogType, message: str, node_id: str | None = None, data=None) -> dict:
     return LogEvent(
@@ -45,11 +57,55 @@ def _log(type: LogType, message: str, node_id: str | None = None, data=None) ->
     ).model_dump()
 
 
-def _topological_sort(graph: FlowGraph) -> list[str]:
+def _topological_sort(graph: FlowGraph) -> tuple[list[str], dict[str, list[str]]]:
+    """Return (order, feeds). Both are cached and shared: callers must not mutate them."""
+    # Kahn's order depends on node and edge order, so key on both as given
+    key = (
+        tuple(n.id for n in graph.nodes),
+        tuple((e.source, e.target) for e in graph.edges),
+    )
+    cached = _topo_cache.get(key)
+    if cached is not None:
+        _topo_cache.move_to_end(key)
+        return cached
+
+    result = _linear_order(graph) or _kahn_order(graph)
+    _topo_cache[key] = result
+    if len(_topo_cache) > _TOPO_CACHE_SIZE:
+        _topo_cache.popitem(last=False)
+    return result
+
+
+def _linear_order(graph: FlowGraph) -> tuple[list[str], dict[str, list[str]]] | None:
+    """Walk a single input->...->output chain, or return None if the graph isn't one."""
+    if len(graph.edges) != len(graph.nodes) - 1:
+        return None
+    nxt: dict[str, str] = {}
+    feeds: dict[str, list[str]] = {}
+    for e in graph.edges:
+        nxt[e.source] = e.target
+        feeds[e.target] = [e.source]
+    if len(nxt) != len(graph.edges) or len(feeds) != len(graph.edges):
+        return None   # some node has in- or out-degree > 1
+    ids = {n.id for n in graph.nodes}
+    nid = next((n.id for n in graph.nodes if n.id not in feeds), None)
+    order = []
+    while nid in ids and len(order) < len(ids):
+        order.append(nid)
+        nid = nxt.get(nid)
+    # A shorter walk means a cycle or dangling edge; let Kahn's report it
+    if len(order) != len(ids) or nid is not None:
+        return None
+    return order, feeds
+
+
+def _kahn_order(graph: FlowGraph) -> tuple[list[str], dict[str, list[str]]]:
     in_degree: dict[str, int] = {n.id: 0 for n in graph.nodes}
     adj: dict[str, list[str]] = defaultdict(list)
+    feeds: dict[str, list[str]] = {}
     for edge in graph.edges:
         adj[edge.source].append(edge.target)
+        feeds.setdefault(edge.target, []).append(edge.source)
         in_degree[edge.target] += 1
     queue = deque(nid for nid, deg in in_degree.items() if deg == 0)
     order = []
@@ -62,7 +118,47 @@ def _topological_sort(graph: FlowGraph) -> list[str]:
                 queue.append(neighbor)
     if len(order) != len(graph.nodes):
         raise ValueError("Flow graph contains a cycle  cannot execute.")
-    return order
+    return order, feeds
+
+
+def _layers(order: list[str], feeds: dict[str, list[str]]) -> list[list[str]]:
+    """Group a topological order into layers; a node sits one past its deepest source."""
+    depth: dict[str, int] = {}
+    layers: list[list[str]] = []
+    for nid in order:
+        d = max((depth[src] + 1 for src in feeds.get(nid, ())), default=0)
+        depth[nid] = d
+        if d == len(layers):
+            layers.append([])
+        layers[d].append(nid)
+    return layers
+
+
+async def _merge_streams(streams: list):
+    """Run several async generators concurrently, yielding items as they arrive."""
+    queue: asyncio.Queue = asyncio.Queue()
+    finished = object()
+
+    async def _pump(stream):
+        try:
+            async for item in stream:
+                queue.put_nowait(item)
+        finally:
+            queue.put_nowait(finished)
+
+    tasks = [asyncio.create_task(_pump(s)) for s in streams]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            item = await queue.get()
+            if item is finished:
+                remaining -= 1
+            else:
+                yield item
+        await asyncio.gather(*tasks)   # re-raise anything a stream raised
+    finally:
+        for task in tasks:
+            task.cancel()
 
 
 def _first_sentence(text: str, max_chars: int = 600) -> str:
@@ -204,37 +300,37 @@ async def execute(
 
     yield _emit(_log(LogType.run, f"Starting execution  {len(graph.nodes)} nodes"))
 
+    allow_semantic_cache(
+        not any(n.data.nodeType in _SIDE_EFFECT_NODE_TYPES for n in graph.nodes)
+    )
+
     try:
-        order = _topological_sort(graph)
+        order, feeds = _topological_sort(graph)
     except ValueError as e:
         yield _emit(_log(LogType.err, str(e)))
         return
 
     node_map = {n.id: n for n in graph.nodes}
 
-    feeds: dict[str, list[str]] = defaultdict(list)
-    edge_handles: dict[tuple[str, str], str] = {}
-    for edge in graph.edges:
-        feeds[edge.target].append(edge.source)
-        if edge.sourceHandle:
-            edge_handles[(edge.source, edge.target)] = edge.sourceHandle
-
     node_outputs:   dict[str, str] = {}
     skipped_nodes:  set[str]       = set()
     executed_nodes: set[str]       = set()   # nodes run inline (parallel)
     variables:      dict[str, str] = {}
+    # Retrievals are pure for one execution; agents and knowledge nodes share them
+    knowledge_cache: dict[tuple[str, int], str] = {}
 
-    for nid in order:
+    async def _run_node(nid: str):
+        nonlocal total_cost
         # Already executed inline by a parent parallel node
         if nid in executed_nodes:
-            continue
+            return
 
         node = node_map[nid]
         ntype = node.data.nodeType
         label = node.data.label
 
         #  Skip propagation 
-        direct_sources = feeds[nid]
+        direct_sources = feeds.get(nid, ())
         if direct_sources:
             all_skipped = all(
                 node_outputs.get(src, "") == _SKIPPED for src in direct_sources
@@ -243,7 +339,7 @@ async def execute(
                 skipped_nodes.add(nid)
                 node_outputs[nid] = _SKIPPED
                 yield _emit(_log(LogType.info, f"   {label} skipped (inactive branch)", nid))
-                continue
+                return
 
         yield _emit(_log(LogType.exec, f" {label}", node_id=nid))
 
@@ -428,6 +524,7 @@ async def execute(
                             session_id=session_id,
                             model_override=model if not child.data.model else None,
                             persist_memory=False,
+                            knowledge_cache=knowledge_cache,
                         )
                     elif ctype == NodeType.tool:
                         requested_tool = child.data.toolName or _guess_tool(child.data.label)
@@ -446,7 +543,7 @@ async def execute(
                             return f"[tool-resolver] {tool_note}\n\n{output}"
                         return output
                     elif ctype == NodeType.knowledge:
-                        kb = know_svc.context_for(user_input, top_k=3)
+                        kb = know_svc.context_for(user_input, top_k=3, cache=knowledge_cache)
                         return kb or context
                     else:
                         return context
@@ -492,6 +589,7 @@ async def execute(
                         session_id=session_id,
                         model_override=model if not node.data.model else None,
                         persist_memory=False,
+                        knowledge_cache=knowledge_cache,
                     ):
                         chunks.append(chunk)
                         yield _emit(_log(LogType.chunk, chunk, nid))
@@ -505,6 +603,7 @@ async def execute(
                         session_id=session_id,
                         model_override=model if not node.data.model else None,
                         persist_memory=False,
+                        knowledge_cache=knowledge_cache,
                     )
 
             #  Tool 
@@ -532,7 +631,7 @@ async def execute(
                 yield _emit(_log(LogType.info, "  Retrieving knowledge context", nid))
                 inline = (node.data.knowledgeText or "").strip()
                 top_k = int(node.data.knowledgeTopK or 3)
-                kb_result = know_svc.context_for(user_input, top_k=top_k)
+                kb_result = know_svc.context_for(user_input, top_k=top_k, cache=knowledge_cache)
                 if kb_result and inline:
                     result = f"{kb_result}\n\nInline knowledge:\n{inline}"
                 elif kb_result:
@@ -593,6 +692,7 @@ async def execute(
                             node_outputs=node_outputs, session_id=session_id,
                             model_override=model if not child.data.model else None,
                             persist_memory=False,
+                            knowledge_cache=knowledge_cache,
                         )
                         loop_results.append(cr)
                 result = json.dumps(loop_results) if loop_results else context
@@ -697,7 +797,20 @@ async def execute(
             yield _emit(_log(LogType.err, f"   {label} failed: {exc}", nid))
             node_outputs[nid] = f"[error: {exc}]"
 
-        await asyncio.sleep(0)
+    # Nodes in one layer don't feed each other, so their LLM/tool awaits overlap.
+    # Layers that write the shared variables dict run in topological order so
+    # sibling templating never depends on timing.
+    for layer in _layers(order, feeds):
+        pending = [nid for nid in layer if nid not in executed_nodes]
+        if len(pending) == 1 or any(
+            node_map[nid].data.nodeType in _VARIABLE_WRITERS for nid in pending
+        ):
+            for nid in pending:
+                async for event in _run_node(nid):
+                    yield event
+        elif pending:
+            async for event in _merge_streams([_run_node(nid) for nid in pending]):
+                yield event
 
     output_nodes = [n for n in graph.nodes if n.data.nodeType == NodeType.output]
     final = "\n".join(node_outputs.get(n.id, "") for n in output_nodes)
@@ -5,16 +5,28 @@ Operations: read, write, list (directory listing), search (glob pattern)
 """
 
 from __future__ import annotations
-import glob as glob_module
+import asyncio
+import fnmatch
+import os
 from pathlib import Path
 
 # Sandbox base directory  same as shell_executor uses
 WORKSPACE = Path.home() / "agentforge_workspace"
 
+# Larger files are truncated on read so one node can't pull a huge file into memory
+MAX_READ_CHARS = 1 << 20
+
+
+_workspace_resolved: Path | None = None
+
 
 def _ensure_workspace() -> Path:
-    WORKSPACE.mkdir(parents=True, exist_ok=True)
-    return WORKSPACE
+    """Create the workspace on first use and return its resolved path."""
+    global _workspace_resolved
+    if _workspace_resolved is None:
+        WORKSPACE.mkdir(parents=True, exist_ok=True)
+        _workspace_resolved = WORKSPACE.resolve()
+    return _workspace_resolved
 
 
 def _safe_resolve(path: str | None) -> Path:
@@ -27,8 +39,15 @@ def _safe_resolve(path: str | None) -> Path:
         return base
     # Strip leading slashes to keep it relative
     clean = path.lstrip("/")
-    candidate = (base / clean).resolve()
-    if not str(candidate).startswith(str(base.resolve())):
+    base_s = str(base)
+    # Cheap lexical check first so "../" escapes never touch the filesystem
+    lexical = os.path.normpath(os.path.join(base_s, clean))
+    if lexical != base_s and not lexical.startswith(base_s + os.sep):
+        raise ValueError(f"Path escapes sandbox: {path!r}")
+    # resolve() still runs to catch symlinks inside the workspace pointing out
+    candidate = Path(lexical).resolve()
+    cand_s = str(candidate)
+    if cand_s != base_s and not cand_s.startswith(base_s + os.sep):
         raise ValueError(f"Path escapes sandbox: {path!r}")
     return candidate
 
@@ -76,19 +95,31 @@ async def _read(path: str | None) -> str:
         raise FileNotFoundError(f"File not found in workspace: {path!r}")
     if not target.is_file():
         raise ValueError(f"Path is not a file: {path!r}")
-    text = target.read_text(encoding="utf-8", errors="replace")
+    text = await asyncio.to_thread(_read_capped, target)
     return f"[read: {path}]\n{text}"
 
 
+def _read_capped(target: Path) -> str:
+    with target.open(encoding="utf-8", errors="replace") as f:
+        text = f.read(MAX_READ_CHARS + 1)
+    if len(text) > MAX_READ_CHARS:
+        return text[:MAX_READ_CHARS] + f"\n[truncated at {MAX_READ_CHARS} characters]"
+    return text
+
+
 async def _write(path: str | None, content: str | None) -> str:
     if not path:
         raise ValueError("fsPath is required for 'write' operation.")
     if content is None:
         content = ""
     target = _safe_resolve(path)
+    await asyncio.to_thread(_write_file, target, content)
+    return f"[write: {path}] Written {len(content)} characters."
+
+
+def _write_file(target: Path, content: str) -> None:
     target.parent.mkdir(parents=True, exist_ok=True)
     target.write_text(content, encoding="utf-8")
-    return f"[write: {path}] Written {len(content)} characters."
 
 
 async def _list(path: str | None, pattern: str | None) -> str:
@@ -98,32 +129,90 @@ async def _list(path: str | None, pattern: str | None) -> str:
     if not target.is_dir():
         raise ValueError(f"Path is not a directory: {path!r}")
 
-    if pattern:
-        matches = list(target.glob(pattern))
-    else:
-        matches = list(target.iterdir())
+    # glob/iterdir and is_dir() stat every entry; keep that off the event loop
+    base = _ensure_workspace()
+    lines = await asyncio.to_thread(_list_lines, target, pattern, base)
+    if not lines:
+        return f"[list: {target.relative_to(base)}] (empty)"
+    return f"[list: {target.relative_to(base)}]\n" + "\n".join(lines)
 
-    if not matches:
-        return f"[list: {target.relative_to(WORKSPACE)}] (empty)"
 
+def _list_lines(target: Path, pattern: str | None, base: Path) -> list[str]:
+    matches = target.glob(pattern) if pattern else target.iterdir()
     lines = []
     for p in sorted(matches):
-        rel = p.relative_to(WORKSPACE)
+        rel = p.relative_to(base)
         kind = "DIR " if p.is_dir() else "FILE"
         lines.append(f"  {kind}  {rel}")
-    return f"[list: {target.relative_to(WORKSPACE)}]\n" + "\n".join(lines)
+    return lines
 
 
 async def _search(pattern: str | None) -> str:
     if not pattern:
         raise ValueError("fsPattern is required for 'search' operation.")
     base = _ensure_workspace()
-    # Use glob relative to workspace
-    full_pattern = str(base / "**" / pattern)
-    matches = glob_module.glob(full_pattern, recursive=True)
-    # Filter to only within workspace
-    safe_matches = [m for m in matches if m.startswith(str(base))]
-    if not safe_matches:
+    matches = await asyncio.to_thread(_search_paths, str(base), pattern)
+    if not matches:
         return f"[search: {pattern}] No matches found."
-    lines = [f"  {Path(m).relative_to(base)}" for m in sorted(safe_matches)]
+    lines = [f"  {m}" for m in matches]
     return f"[search: {pattern}]\n" + "\n".join(lines)
+
+
+def _search_paths(base: str, pattern: str) -> list[str]:
+    """
+    Workspace-relative paths matching pattern at any depth, like glob's
+    base/**/pattern: one scandir per directory, hidden entries only matched by
+    pattern segments that start with ".", symlinked dirs not followed. As with
+    glob, a trailing "/" matches directories only and an all-"**" pattern also
+    matches the workspace root (listed as ".").
+    """
+    dirs_only = pattern.endswith("/")
+    pat_parts = ["**"] + pattern.rstrip("/").split("/")
+    # A trailing "**" spans zero components only for directories; a file has
+    # to sit at least one level below whatever precedes it
+    file_parts = pat_parts[:-1] + ["*", "**"] if pat_parts[-1] == "**" else pat_parts
+    wants_hidden = any(pp.startswith(".") for pp in pat_parts)
+    prefix_len = len(base) + 1
+    matches = ["."] if _match_parts([], pat_parts) else []
+    stack = [base]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                hidden = entry.name.startswith(".")
+                if (wants_hidden or not hidden) and entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                if hidden and not pat_parts[-1].startswith("."):
+                    continue
+                is_dir = entry.is_dir()
+                if dirs_only and not is_dir:
+                    continue
+                rel = entry.path[prefix_len:]
+                if _match_parts(rel.split(os.sep), pat_parts if is_dir else file_parts):
+                    matches.append(rel)
+    # Same order as sorting glob's own strings (trailing "/" on directory matches)
+    return sorted(matches, key=lambda m: "" if m == "." else m + "/" if dirs_only else m)
+
+
+def _match_parts(parts: list[str], pat_parts: list[str]) -> bool:
+    """Segment-wise glob match; "**" spans zero or more non-hidden directories."""
+    if not pat_parts:
+        return not parts
+    pp = pat_parts[0]
+    if pp == "**":
+        rest = pat_parts[1:]
+        for i in range(len(parts) + 1):
+            if _match_parts(parts[i:], rest):
+                return True
+            if i < len(parts) and parts[i].startswith("."):
+                return False
+        return False
+    if not parts:
+        return False
+    p = parts[0]
+    if p.startswith(".") and not pp.startswith("."):
+        return False
+    return fnmatch.fnmatch(p, pp) and _match_parts(parts[1:], pat_parts[1:])
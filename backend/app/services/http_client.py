@@ -0,0 +1,39 @@
+"""
+Outbound HTTP client for services  one pooled HTTP/2 AsyncClient for the
+HTTP tools and Power BI, kept apart from the LLM provider client.
+Cookies are never stored, so a Set-Cookie seen by one flow's tool call is
+not replayed on later calls. Callers pass their own timeout per request.
+Created lazily and closed from main.py lifespan on shutdown.
+"""
+
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+
+import httpx
+
+_client: httpx.AsyncClient | None = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the process-wide services client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=50,
+                keepalive_expiry=60.0,
+            ),
+            http2=True,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            # Empty allow-list: the jar accepts and sends no cookies
+            cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """Close the services client (called from main.py lifespan on shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
@@ -4,10 +4,21 @@ v1: Simple TF-style keyword matching (no external vector DB required).
 v2: Swap in ChromaDB / FAISS by implementing the same interface.
 """
 
+import heapq
 import re
+from collections import Counter, defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime
 
+try:
+    import numpy as np
+    from scipy import sparse
+    _sparse_available = True
+except ImportError:
+    _sparse_available = False
+
+_WORD_RE = re.compile(r"\w+")
+
 
 @dataclass
 class Document:
@@ -15,40 +26,118 @@ class Document:
     title:   str
     content: str
     chunks:  list[str] = field(default_factory=list)
+    tokens:  list[frozenset[str]] = field(default_factory=list)   # per-chunk word sets
     added:   str = field(default_factory=lambda: datetime.utcnow().isoformat())
 
 
 # Global in-memory store
 _store: dict[str, Document] = {}
 
+# Inverted index: token -> [(doc_id, chunk_idx)], plus (doc_id, idx) -> (title, chunk)
+_postings: dict[str, list[tuple[str, int]]] = defaultdict(list)
+_chunk_ref: dict[tuple[str, int], tuple[str, str]] = {}
+# doc_id -> position in store order, kept when a document is re-added, so
+# equal scores rank by (doc position, chunk idx) like a scan over _store
+_doc_seq: dict[str, int] = {}
+_next_seq = 0
 
-def _chunk_text(text: str, size: int = 400, overlap: int = 80) -> list[str]:
-    """Split text into overlapping character chunks."""
-    chunks = []
-    start = 0
-    while start < len(text):
-        end = start + size
-        chunks.append(text[start:end])
-        start += size - overlap
-    return chunks
+# Binary chunk x vocabulary matrix (CSC, so a query only touches its own
+# columns) used when scipy is installed. Rebuilt lazily on the first retrieve
+# after the store changes; row i is _matrix_refs[i].
+_matrix = None
+_matrix_refs: list[tuple[str, int]] = []
+_vocab: dict[str, int] = {}
 
 
-def _score(query: str, chunk: str) -> float:
-    """Simple keyword overlap score (0.01.0)."""
-    q_words = set(re.findall(r"\w+", query.lower()))
-    c_words = set(re.findall(r"\w+", chunk.lower()))
-    if not q_words:
-        return 0.0
-    return len(q_words & c_words) / len(q_words)
+def _iter_chunks(text: str, size: int = 400, overlap: int = 80):
+    """Yield overlapping character chunks lazily."""
+    for start in range(0, len(text), size - overlap):
+        yield text[start:start + size]
+
+
+def _tokenize(text: str) -> frozenset[str]:
+    return frozenset(_WORD_RE.findall(text.lower()))
+
+
+def _build_matrix() -> None:
+    global _matrix, _matrix_refs, _vocab
+    vocab: dict[str, int] = {}
+    indices: list[int] = []
+    indptr = [0]
+    refs: list[tuple[str, int]] = []
+    for doc in _store.values():
+        for idx, words in enumerate(doc.tokens):
+            indices.extend(vocab.setdefault(w, len(vocab)) for w in words)
+            indptr.append(len(indices))
+            refs.append((doc.id, idx))
+    data = np.ones(len(indices), dtype=np.float32)
+    _matrix = sparse.csr_matrix((data, indices, indptr), shape=(len(refs), len(vocab))).tocsc()
+    _matrix_refs, _vocab = refs, vocab
+
+
+def _top_refs_sparse(q_words: frozenset[str], top_k: int) -> list[tuple[str, int]]:
+    if _matrix is None:
+        _build_matrix()
+    cols = [_vocab[w] for w in q_words if w in _vocab]
+    if not cols or top_k <= 0:
+        return []
+    scores = np.asarray(_matrix[:, cols].sum(axis=1)).ravel()
+    # Rows are in store order, so a stable sort of the matching rows ranks
+    # ties the same way as the postings path
+    hits = np.flatnonzero(scores)
+    top = hits[np.argsort(-scores[hits], kind="stable")[:top_k]]
+    return [_matrix_refs[i] for i in top]
 
 
 def add_document(doc_id: str, title: str, content: str) -> Document:
-    chunks = _chunk_text(content)
-    doc = Document(id=doc_id, title=title, content=content, chunks=chunks)
+    global _matrix, _next_seq
+    old = _store.get(doc_id)
+    if old is not None:
+        # Re-adding replaces the document in place, keeping its store position
+        _unindex(old)
+    else:
+        _doc_seq[doc_id] = _next_seq
+        _next_seq += 1
+    # One pass over the chunks fills the document and the postings index
+    chunks: list[str] = []
+    tokens: list[frozenset[str]] = []
+    for idx, chunk in enumerate(_iter_chunks(content)):
+        words = _tokenize(chunk)
+        chunks.append(chunk)
+        tokens.append(words)
+        ref = (doc_id, idx)
+        _chunk_ref[ref] = (title, chunk)
+        for word in words:
+            _postings[word].append(ref)
+    doc = Document(id=doc_id, title=title, content=content, chunks=chunks, tokens=tokens)
     _store[doc_id] = doc
+    _matrix = None
     return doc
 
 
+def remove_document(doc_id: str) -> bool:
+    """Drop a document and its postings. Returns False if it wasn't stored."""
+    doc = _store.pop(doc_id, None)
+    if doc is None:
+        return False
+    _doc_seq.pop(doc_id, None)
+    _unindex(doc)
+    return True
+
+
+def _unindex(doc: Document) -> None:
+    global _matrix
+    _matrix = None
+    for idx, words in enumerate(doc.tokens):
+        _chunk_ref.pop((doc.id, idx), None)
+        for word in words:
+            refs = [r for r in _postings.get(word, ()) if r[0] != doc.id]
+            if refs:
+                _postings[word] = refs
+            else:
+                _postings.pop(word, None)
+
+
 def list_documents() -> list[dict]:
     return [{"id": d.id, "title": d.title, "chunks": len(d.chunks), "added": d.added}
             for d in _store.values()]
@@ -56,18 +145,35 @@ def list_documents() -> list[dict]:
 
 def retrieve(query: str, top_k: int = 3) -> list[str]:
     """Return the top-k most relevant chunks across all documents."""
-    scored: list[tuple[float, str]] = []
-    for doc in _store.values():
-        for chunk in doc.chunks:
-            s = _score(query, chunk)
-            if s > 0:
-                scored.append((s, f"[{doc.title}] {chunk}"))
-    scored.sort(key=lambda x: x[0], reverse=True)
-    return [text for _, text in scored[:top_k]]
-
-
-def context_for(query: str, top_k: int = 3) -> str:
-    """Return retrieved chunks joined as a context string."""
+    q_words = _tokenize(query)
+    if not q_words:
+        return []
+    if _sparse_available:
+        refs = _top_refs_sparse(q_words, top_k)
+    else:
+        # Only chunks sharing at least one query token are visited. Dividing by
+        # len(q_words) is the same for every chunk, so rank by raw overlap count.
+        counts: Counter[tuple[str, int]] = Counter()
+        for word in q_words:
+            postings = _postings.get(word)
+            if postings:
+                counts.update(postings)
+        refs = heapq.nsmallest(top_k, counts, key=lambda r: (-counts[r], _doc_seq[r[0]], r[1]))
+    return [f"[{title}] {chunk}" for title, chunk in map(_chunk_ref.__getitem__, refs)]
+
+
+def context_for(query: str, top_k: int = 3,
+                cache: dict[tuple[str, int], str] | None = None) -> str:
+    """
+    Return retrieved chunks joined as a context string. Pass a dict as cache to
+    reuse results for repeated (query, top_k) pairs, e.g. within one execution.
+    """
+    if cache is not None:
+        key = (query, top_k)
+        hit = cache.get(key)
+        if hit is None:
+            hit = cache[key] = context_for(query, top_k)
+        return hit
     chunks = retrieve(query, top_k)
     if not chunks:
         return ""
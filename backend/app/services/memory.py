@@ -1,40 +1,89 @@
 """
 Memory Service
 - Short-term: in-process dict keyed by session_id (cleared on restart)
-- Long-term: JSON file at ~/.agentforge/memory/<session_id>.json
+- Long-term: SQLite (WAL) at ~/.agentforge/memory/memory.db, one row per (session, key)
 """
 
 import json
-import os
+import sqlite3
+from collections import deque
+from itertools import islice
 from pathlib import Path
 from datetime import datetime
 
-_short_term: dict[str, list[dict]] = {}
+SHORT_TERM_TURNS = 20
 
-MEMORY_DIR = Path.home() / ".agentforge" / "memory"
+_short_term: dict[str, deque[dict]] = {}
 
+MEMORY_DIR = Path.home() / ".agentforge" / "memory"
 
-def _session_file(session_id: str) -> Path:
-    MEMORY_DIR.mkdir(parents=True, exist_ok=True)
-    return MEMORY_DIR / f"{session_id}.json"
+_long_conn: sqlite3.Connection | None = None
+_migrated: set[str] = set()   # sessions already checked for a legacy JSON file
+
+
+def _db() -> sqlite3.Connection:
+    global _long_conn
+    if _long_conn is None:
+        MEMORY_DIR.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(MEMORY_DIR / "memory.db", check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS longmem (
+                session TEXT NOT NULL,
+                key     TEXT NOT NULL,
+                value   TEXT NOT NULL,
+                ts      TEXT NOT NULL,
+                PRIMARY KEY (session, key)
+            )
+        """)
+        conn.commit()
+        _long_conn = conn
+    return _long_conn
+
+
+def _migrate_legacy(session_id: str) -> None:
+    """
+    One-time import of a pre-SQLite <session_id>.json memory file. Rows already
+    in longmem win; the file is renamed to .json.migrated afterwards.
+    """
+    if session_id in _migrated:
+        return
+    _migrated.add(session_id)
+    path = MEMORY_DIR / f"{session_id}.json"
+    if not path.is_file():
+        return
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, ValueError):
+        return
+    conn = _db()
+    conn.executemany(
+        "INSERT OR IGNORE INTO longmem (session, key, value, ts) VALUES (?, ?, ?, ?)",
+        [
+            (session_id, key, str(entry.get("value", "")), entry.get("ts") or datetime.utcnow().isoformat())
+            for key, entry in data.items() if isinstance(entry, dict)
+        ],
+    )
+    conn.commit()
+    path.rename(path.with_name(path.name + ".migrated"))
 
 
 #  Short-term 
 
 def store_short(session_id: str, role: str, content: str) -> None:
-    if session_id not in _short_term:
-        _short_term[session_id] = []
-    _short_term[session_id].append({
+    # Bounded deque keeps the last SHORT_TERM_TURNS turns; append evicts the oldest
+    history = _short_term.get(session_id)
+    if history is None:
+        history = _short_term[session_id] = deque(maxlen=SHORT_TERM_TURNS)
+    history.append({
         "role": role,
         "content": content,
         "ts": datetime.utcnow().isoformat(),
     })
-    # Keep last 20 turns
-    _short_term[session_id] = _short_term[session_id][-20:]
 
 
 def get_short(session_id: str) -> list[dict]:
-    return _short_term.get(session_id, [])
+    return list(_short_term.get(session_id, ()))
 
 
 def clear_short(session_id: str) -> None:
@@ -44,19 +93,19 @@ def clear_short(session_id: str) -> None:
 #  Long-term 
 
 def store_long(session_id: str, key: str, value: str) -> None:
-    path = _session_file(session_id)
-    data: dict = {}
-    if path.exists():
-        data = json.loads(path.read_text())
-    data[key] = {"value": value, "ts": datetime.utcnow().isoformat()}
-    path.write_text(json.dumps(data, indent=2))
+    _migrate_legacy(session_id)
+    conn = _db()
+    conn.execute(
+        "INSERT OR REPLACE INTO longmem (session, key, value, ts) VALUES (?, ?, ?, ?)",
+        (session_id, key, value, datetime.utcnow().isoformat()),
+    )
+    conn.commit()
 
 
 def get_long(session_id: str) -> dict:
-    path = _session_file(session_id)
-    if not path.exists():
-        return {}
-    return json.loads(path.read_text())
+    _migrate_legacy(session_id)
+    rows = _db().execute("SELECT key, value, ts FROM longmem WHERE session = ?", (session_id,))
+    return {key: {"value": value, "ts": ts} for key, value, ts in rows}
 
 
 #  Context injection 
@@ -66,17 +115,18 @@ def inject_context(session_id: str, messages: list[dict]) -> list[dict]:
     Prepend short-term conversation history as a system recap.
     Returns a new messages list.
     """
-    history = get_short(session_id)
-    if not history:
+    # Last 6 turns straight off the deque, without copying the whole history
+    tail = list(islice(reversed(_short_term.get(session_id, ())), 6))
+    if not tail:
         return messages
+    tail.reverse()
 
     recap = "Previous conversation:\n" + "\n".join(
-        f"  {m['role']}: {m['content'][:200]}" for m in history[-6:]
+        [f"  {m['role']}: {m['content'][:200]}" for m in tail]
     )
     system_recap = {"role": "system", "content": recap}
 
     # Insert after any existing system message
-    result = list(messages)
-    if result and result[0]["role"] == "system":
-        return [result[0], system_recap] + result[1:]
-    return [system_recap] + result
+    if messages and messages[0]["role"] == "system":
+        return [messages[0], system_recap, *messages[1:]]
+    return [system_recap, *messages]
@@ -8,8 +8,9 @@ Strategy:
 """
 
 import json
-import re
 import uuid
+
+import orjson
 from app.llm.registry import get_llm
 from app.models.schema import FlowGraph, Node, NodeData, NodePosition, Edge, NodeType
 
@@ -39,63 +40,51 @@ Example output:
 }"""
 
 
-def _template_flow(prompt: str) -> FlowGraph:
-    """Keyword-matched fallback templates."""
-    lower = prompt.lower()
-    if any(w in lower for w in ["search", "research", "web", "find"]):
-        template = "research"
-    elif any(w in lower for w in ["chat", "customer", "support", "qa"]):
-        template = "chat"
-    elif any(w in lower for w in ["code", "script", "program", "debug"]):
-        template = "code"
-    elif any(w in lower for w in ["data", "csv", "analys", "report"]):
-        template = "data"
-    else:
-        template = "generic"
-
-    templates = {
-        "research": [
-            ("n1","input",  "User Query",   80,  150),
-            ("n2","agent",  "AI Agent",     310, 80),
-            ("n3","tool",   "Web Search",   310, 240),
-            ("n4","agent",  "Summarizer",   550, 150),
-            ("n5","output", "Answer",       780, 150),
-        ],
-        "chat": [
-            ("n1","input",     "User Message", 80,  150),
-            ("n2","knowledge", "Memory",       310, 80),
-            ("n3","agent",     "Chat Agent",   310, 230),
-            ("n4","output",    "Response",     560, 150),
-        ],
-        "code": [
-            ("n1","input",  "Task Input",  80,  150),
-            ("n2","agent",  "Code Agent",  310, 80),
-            ("n3","tool",   "Code Runner", 310, 240),
-            ("n4","agent",  "Reviewer",    550, 150),
-            ("n5","output", "Output",      780, 150),
-        ],
-        "data": [
-            ("n1","input",     "Data Source", 80,  150),
-            ("n2","knowledge", "Vector DB",   310, 80),
-            ("n3","agent",     "Analyst",     310, 230),
-            ("n4","tool",      "Code Runner", 550, 150),
-            ("n5","output",    "Report",      780, 150),
-        ],
-        "generic": [
-            ("n1","input",  "Input",   80,  150),
-            ("n2","agent",  "Agent",   320, 150),
-            ("n3","output", "Output",  560, 150),
-        ],
-    }
-
-    raw_nodes = templates[template]
-    ICONS = {"input":"","agent":"","tool":"","knowledge":"","output":""}
-
+_ICONS = {"input":"","agent":"","tool":"","knowledge":"","output":""}
+
+_TEMPLATES = {
+    "research": [
+        ("n1","input",  "User Query",   80,  150),
+        ("n2","agent",  "AI Agent",     310, 80),
+        ("n3","tool",   "Web Search",   310, 240),
+        ("n4","agent",  "Summarizer",   550, 150),
+        ("n5","output", "Answer",       780, 150),
+    ],
+    "chat": [
+        ("n1","input",     "User Message", 80,  150),
+        ("n2","knowledge", "Memory",       310, 80),
+        ("n3","agent",     "Chat Agent",   310, 230),
+        ("n4","output",    "Response",     560, 150),
+    ],
+    "code": [
+        ("n1","input",  "Task Input",  80,  150),
+        ("n2","agent",  "Code Agent",  310, 80),
+        ("n3","tool",   "Code Runner", 310, 240),
+        ("n4","agent",  "Reviewer",    550, 150),
+        ("n5","output", "Output",      780, 150),
+    ],
+    "data": [
+        ("n1","input",     "Data Source", 80,  150),
+        ("n2","knowledge", "Vector DB",   310, 80),
+        ("n3","agent",     "Analyst",     310, 230),
+        ("n4","tool",      "Code Runner", 550, 150),
+        ("n5","output",    "Report",      780, 150),
+    ],
+    "generic": [
+        ("n1","input",  "Input",   80,  150),
+        ("n2","agent",  "Agent",   320, 150),
+        ("n3","output", "Output",  560, 150),
+    ],
+}
+
+
+def _build_template(template: str) -> FlowGraph:
+    raw_nodes = _TEMPLATES[template]
     nodes = [
         Node(
             id=nid, type="agentNode",
             position=NodePosition(x=x, y=y),
-            data=NodeData(nodeType=NodeType(nt), label=lbl, icon=ICONS.get(nt,"")),
+            data=NodeData(nodeType=NodeType(nt), label=lbl, icon=_ICONS.get(nt,"")),
         )
         for nid, nt, lbl, x, y in raw_nodes
     ]
@@ -119,13 +108,46 @@ def _template_flow(prompt: str) -> FlowGraph:
     return FlowGraph(nodes=nodes, edges=edges)
 
 
+# Templates are built and validated once; callers only serialize them
+_PRECOMPUTED: dict[str, FlowGraph] = {name: _build_template(name) for name in _TEMPLATES}
+
+# Keyword -> template, checked in priority order ("search" also covers "research")
+_TEMPLATE_KEYWORDS = (
+    ("research", ("search", "web", "find")),
+    ("chat",     ("chat", "customer", "support", "qa")),
+    ("code",     ("code", "script", "program", "debug")),
+    ("data",     ("data", "csv", "analys", "report")),
+)
+
+
+def _match_template(lower: str) -> str:
+    for template, words in _TEMPLATE_KEYWORDS:
+        for word in words:
+            if word in lower:
+                return template
+    return "generic"
+
+
+def _template_flow(prompt: str) -> FlowGraph:
+    """Keyword-matched fallback templates."""
+    return _PRECOMPUTED[_match_template(prompt.lower())]
+
+
+_DECODER = json.JSONDecoder()
+
+
 def _parse_llm_graph(raw_json: str) -> FlowGraph:
     """Parse LLM output into a FlowGraph or raise ValueError."""
-    # Strip markdown fences if present
-    raw_json = re.sub(r"```[a-z]*", "", raw_json).strip().strip("`")
-    data = json.loads(raw_json)
-
-    ICONS = {"input":"","agent":"","tool":"","knowledge":"","output":""}
+    # Take the JSON object out of any markdown fences or surrounding prose
+    start = raw_json.find("{")
+    if start < 0:
+        raise ValueError("No JSON object in LLM output")
+    end = raw_json.rfind("}") + 1
+    try:
+        data = orjson.loads(raw_json[start:end])
+    except orjson.JSONDecodeError:
+        # Trailing text containing braces: decode just the first object
+        data, _ = _DECODER.raw_decode(raw_json, start)
 
     nodes = [
         Node(
@@ -134,7 +156,7 @@ def _parse_llm_graph(raw_json: str) -> FlowGraph:
             data=NodeData(
                 nodeType=NodeType(n.get("nodeType", "agent")),
                 label=n.get("label", "Node"),
-                icon=ICONS.get(n.get("nodeType", "agent"), ""),
+                icon=_ICONS.get(n.get("nodeType", "agent"), ""),
             ),
         )
         for n in data["nodes"]
@@ -6,17 +6,131 @@ Handles Interactive Device Code Flow and executing Power BI APIs.
 from __future__ import annotations
 import asyncio
 import os
-import requests
-from msal import PublicClientApplication
+import time
+from pathlib import Path
 
+import httpx
+import orjson
+from msal import PublicClientApplication, SerializableTokenCache
+
+from app.services.http_client import get_client
 from app.models.schema import Node
 from app.models.schema import LogType
 
 POWERBI_CLIENT_ID = os.getenv("POWERBI_CLIENT_ID", "dummy-client-id-if-not-set")
 AUTHORITY = "https://login.microsoftonline.com/organizations"
 SCOPES = ["https://analysis.windows.net/powerbi/api/.default"]
+PBI_TIMEOUT = 30.0
+MAX_RESULT_CHARS = 200_000   # DAX results are passed on as raw JSON text
+# How long a refresh node waits for completion before reporting it as running
+REFRESH_POLL_TIMEOUT = float(os.getenv("POWERBI_REFRESH_TIMEOUT", "120"))
+REFRESH_POLL_MAX_DELAY = 30.0
+_REFRESH_RUNNING = {"Unknown", "NotStarted", "InProgress"}
+PBI_DATASET_URL = "https://api.powerbi.com/v1.0/myorg/groups/{workspace}/datasets/{dataset}"
+
+# action -> (dataset endpoint, request body factory taking the query)
+_ACTIONS = {
+    "dax_query": ("executeQueries", lambda q: {
+        "queries": [{"query": q}],
+        "serializerSettings": {"includeNulls": True},
+    }),
+    "refresh": ("refreshes", lambda q: {}),   # empty {} body = default refresh
+}
+TOKEN_EXPIRY_MARGIN = 60   # seconds; refresh before Power BI rejects the token
+TOKEN_CACHE_PATH = Path.home() / ".agentforge" / "pbi_token.bin"
+
+# Persisted MSAL token cache so later runs can refresh silently instead of
+# asking the user to repeat the device-code flow. Loaded on first use.
+_token_cache = SerializableTokenCache()
+_token_cache_loaded = False
+
+app = PublicClientApplication(POWERBI_CLIENT_ID, authority=AUTHORITY, token_cache=_token_cache)
+
+# (access_token, expires_at); lets warm runs skip MSAL's account lookup and
+# silent acquisition entirely
+_access_token: tuple[str, float] | None = None
+
+
+def _load_token_cache() -> None:
+    """Read the persisted token cache once; a bad file just means a new login."""
+    global _token_cache_loaded
+    if _token_cache_loaded:
+        return
+    _token_cache_loaded = True
+    try:
+        if TOKEN_CACHE_PATH.exists():
+            _token_cache.deserialize(TOKEN_CACHE_PATH.read_text())
+    except (OSError, ValueError) as e:
+        print(f"  Ignoring unreadable Power BI token cache {TOKEN_CACHE_PATH}: {e}")
+        _token_cache.deserialize("{}")
+
+
+def _save_token_cache() -> None:
+    """Atomically write the token cache (owner-only) if MSAL changed it."""
+    if not _token_cache.has_state_changed:
+        return
+    TOKEN_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = TOKEN_CACHE_PATH.with_suffix(".tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(_token_cache.serialize())
+    os.replace(tmp, TOKEN_CACHE_PATH)
+
+
+def _valid_access_token() -> str | None:
+    """Return the in-process access token if it has not (nearly) expired."""
+    if _access_token is not None and time.time() < _access_token[1]:
+        return _access_token[0]
+    return None
+
+
+def _remember_token(result: dict) -> str:
+    """Keep an MSAL result's access token until shortly before it expires."""
+    global _access_token
+    token = result["access_token"]
+    _access_token = (token, time.time() + int(result.get("expires_in", 0)) - TOKEN_EXPIRY_MARGIN)
+    return token
+
+
+async def _poll_refresh(url: str, headers: dict, refresh_id: str):
+    """
+    Poll the dataset's refresh history with exponential backoff until the
+    refresh finishes or REFRESH_POLL_TIMEOUT passes, yielding a progress event
+    per poll and then the result event. The history endpoint covers every
+    refresh type; a poll failure leaves the accepted refresh running, so it is
+    reported as unknown rather than as an error.
+    """
+    client = get_client()
+    start = time.monotonic()
+    delay = 2.0
+    while time.monotonic() - start < REFRESH_POLL_TIMEOUT:
+        await asyncio.sleep(min(delay, max(0.0, REFRESH_POLL_TIMEOUT - (time.monotonic() - start))))
+        try:
+            res = await client.get(url, headers=headers, params={"$top": 5}, timeout=PBI_TIMEOUT)
+            res.raise_for_status()
+            history = orjson.loads(res.content).get("value") or []
+        except httpx.HTTPStatusError as e:
+            yield {"type": "result", "message": f"Dataset refresh triggered; status unknown "
+                                                f"(HTTP {e.response.status_code} while polling)."}
+            return
+        except (httpx.HTTPError, ValueError) as e:
+            yield {"type": "result", "message": f"Dataset refresh triggered; status unknown ({e})."}
+            return
+        # A refresh that isn't listed yet is treated as still queued
+        entry = next((r for r in history if r.get("requestId") == refresh_id), {})
+        status = entry.get("status", "Unknown")
+        if status == "Completed":
+            yield {"type": "result", "message": "Dataset refresh completed."}
+            return
+        if status not in _REFRESH_RUNNING:
+            yield {"type": "result", "message": f"Dataset refresh finished with status: {status}."}
+            return
+        yield {"type": LogType.info,
+               "message": f"Refresh still running ({time.monotonic() - start:.0f}s elapsed)..."}
+        delay = min(delay * 2, REFRESH_POLL_MAX_DELAY)
+    yield {"type": "result", "message": f"Dataset refresh still running after {REFRESH_POLL_TIMEOUT:.0f}s; "
+                                        "check its status in Power BI."}
 
-app = PublicClientApplication(POWERBI_CLIENT_ID, authority=AUTHORITY)
 
 async def run_powerbi_node(node: Node, context: str):
     """
@@ -31,76 +145,94 @@ async def run_powerbi_node(node: Node, context: str):
 
     yield {"type": LogType.info, "message": f"Action: {action}, Workspace: {workspace_id}"}
 
-    # 1. Start Device Code Auth
-    flow = app.initiate_device_flow(scopes=SCOPES)
-    if "user_code" not in flow:
-        yield {"type": LogType.err, "message": "Failed to initiate device code flow."}
-        yield {"type": "result", "message": "Auth Error"}
+    if action not in _ACTIONS:
+        yield {"type": "result", "message": f"Unknown action: {action}"}
         return
 
-    # Yield the auth message so UI can show it
-    auth_msg = flow["message"]
-    yield {"type": "auth_required", "message": auth_msg, "data": {
-        "user_code": flow["user_code"],
-        "verification_uri": flow["verification_uri"]
-    }}
-
-    # Wait for user to authenticate
-    # `acquire_token_by_device_flow` blocks. We need to run it in a thread so we don't block the async loop.
-    yield {"type": LogType.info, "message": "Waiting for user authentication..."}
-    
-    def wait_for_token():
-        return app.acquire_token_by_device_flow(flow)
-        
-    result = await asyncio.to_thread(wait_for_token)
-    
-    if "access_token" not in result:
-        err = result.get("error_description", "Unknown error")
-        yield {"type": LogType.err, "message": f"Authentication failed: {err}"}
-        yield {"type": "result", "message": "Auth Error"}
-        return
+    # 1. Reuse the token from an earlier run while it is still valid
+    access_token = _valid_access_token()
+    if access_token:
+        yield {"type": LogType.info, "message": "Using cached Power BI credentials."}
+    else:
+        # 2. Ask MSAL's cache next (MSAL is sync, keep it off the loop)
+        result = None
+        await asyncio.to_thread(_load_token_cache)
+        accounts = app.get_accounts()
+        if accounts:
+            result = await asyncio.to_thread(app.acquire_token_silent, SCOPES, account=accounts[0])
+            if result and "access_token" in result:
+                yield {"type": LogType.info, "message": "Using cached Power BI credentials."}
+
+        # 3. Otherwise start Device Code Auth
+        if not result or "access_token" not in result:
+            flow = app.initiate_device_flow(scopes=SCOPES)
+            if "user_code" not in flow:
+                yield {"type": LogType.err, "message": "Failed to initiate device code flow."}
+                yield {"type": "result", "message": "Auth Error"}
+                return
+
+            # Yield the auth message so UI can show it
+            auth_msg = flow["message"]
+            yield {"type": "auth_required", "message": auth_msg, "data": {
+                "user_code": flow["user_code"],
+                "verification_uri": flow["verification_uri"]
+            }}
+
+            # Wait for user to authenticate
+            # `acquire_token_by_device_flow` blocks. We need to run it in a thread so we don't block the async loop.
+            yield {"type": LogType.info, "message": "Waiting for user authentication..."}
+
+            def wait_for_token():
+                return app.acquire_token_by_device_flow(flow)
+
+            result = await asyncio.to_thread(wait_for_token)
+
+            if "access_token" not in result:
+                err = result.get("error_description", "Unknown error")
+                yield {"type": LogType.err, "message": f"Authentication failed: {err}"}
+                yield {"type": "result", "message": "Auth Error"}
+                return
+
+        _save_token_cache()
+        access_token = _remember_token(result)
 
-    access_token = result["access_token"]
     yield {"type": LogType.info, "message": "Authentication successful. Executing Power BI action..."}
 
-    # 2. Execute Action
+    # 4. Execute Action
     headers = {
         "Authorization": f"Bearer {access_token}",
         "Content-Type": "application/json"
     }
 
+    endpoint, make_payload = _ACTIONS[action]
+    url = f"{PBI_DATASET_URL.format(workspace=workspace_id, dataset=dataset_id)}/{endpoint}"
+
     try:
-        def do_request():
-            if action == "dax_query":
-                url = f"https://api.powerbi.com/v1.0/myorg/groups/{workspace_id}/datasets/{dataset_id}/executeQueries"
-                payload = {
-                    "queries": [{"query": query}],
-                    "serializerSettings": {"includeNulls": True}
-                }
-                res = requests.post(url, headers=headers, json=payload)
-                res.raise_for_status()
-                return str(res.json())
-            elif action == "refresh":
-                url = f"https://api.powerbi.com/v1.0/myorg/groups/{workspace_id}/datasets/{dataset_id}/refreshes"
-                # Post body must be an empty {} for default refresh
-                res = requests.post(url, headers=headers, json={})
-                if res.status_code == 202:
-                    return "Dataset refresh triggered successfully (Accepted)."
-                res.raise_for_status()
-                return "Dataset refresh triggered successfully."
+        # Shared pooled client: concurrent Power BI nodes reuse connections
+        res = await get_client().post(url, headers=headers, content=orjson.dumps(make_payload(query)),
+                                      timeout=PBI_TIMEOUT)
+        res.raise_for_status()
+        if action == "refresh":
+            refresh_id = res.headers.get("RequestId")
+            if refresh_id:
+                yield {"type": LogType.info, "message": f"Refresh {refresh_id} accepted, waiting up to "
+                                                        f"{REFRESH_POLL_TIMEOUT:.0f}s for completion..."}
+                async for event in _poll_refresh(url, headers, refresh_id):
+                    yield event
+                return
             else:
-                return f"Unknown action: {action}"
-                
-        api_result = await asyncio.to_thread(do_request)
+                api_result = "Dataset refresh triggered successfully."
+        else:
+            api_result = res.text
+            if len(api_result) > MAX_RESULT_CHARS:
+                api_result = api_result[:MAX_RESULT_CHARS] + f"\n[truncated at {MAX_RESULT_CHARS} characters]"
         yield {"type": "result", "message": api_result}
-        
-    except requests.exceptions.HTTPError as e:
-        err_msg = str(e)
-        if e.response is not None:
-             try:
-                 err_msg = f"{e} - {e.response.json()}"
-             except ValueError:
-                 err_msg = f"{e} - {e.response.text}"
+
+    except httpx.HTTPStatusError as e:
+        try:
+            err_msg = f"{e} - {orjson.loads(e.response.content)}"
+        except ValueError:
+            err_msg = f"{e} - {e.response.text}"
         yield {"type": LogType.err, "message": f"Power BI HTTP error: {err_msg}"}
         yield {"type": "result", "message": f"Error: {err_msg}"}
     except Exception as e:
@@ -12,30 +12,59 @@ import asyncio
 import os
 import re
 import sys
-import tempfile
 from pathlib import Path
 
+try:
+    import re2
+    _re2_available = True
+except ImportError:
+    _re2_available = False
+
 # Sandbox base directory
 WORKSPACE = Path.home() / "agentforge_workspace"
+_workspace_resolved: Path | None = None
+
+# Child processes get a fixed, minimal environment built once: no API keys
+# or other backend settings leak into sandboxed commands
+_PY_EXE = sys.executable
+_ENV_ALLOWLIST = (
+    "PATH", "USER", "LOGNAME", "SHELL", "TMPDIR", "TEMP", "TMP", "LC_ALL", "TZ",
+    "SYSTEMROOT", "COMSPEC", "PATHEXT",   # needed to start processes on Windows
+)
+_SUB_ENV = {k: os.environ[k] for k in _ENV_ALLOWLIST if k in os.environ}
+_SUB_ENV["HOME"] = str(Path.home())
+_SUB_ENV["LANG"] = os.environ.get("LANG", "C.UTF-8")
 
 # Patterns that are never allowed, regardless of context
-_BLOCKLIST: list[re.Pattern] = [
-    re.compile(r"\brm\s+-rf\s+/", re.IGNORECASE),
-    re.compile(r"\bsudo\b", re.IGNORECASE),
-    re.compile(r"\bsu\s+-\b", re.IGNORECASE),
-    re.compile(r"\bmkfs\b", re.IGNORECASE),
-    re.compile(r"\bdd\s+if=", re.IGNORECASE),
-    re.compile(r":\s*\(\s*\)\s*\{.*\}", re.IGNORECASE),  # fork bombs
-    re.compile(r"\bchmod\s+777\s+/", re.IGNORECASE),
-    re.compile(r"\bcurl\b.*\|\s*(?:ba)?sh", re.IGNORECASE),
-    re.compile(r"\bwget\b.*\|\s*(?:ba)?sh", re.IGNORECASE),
-    re.compile(r"\b(?:shutdown|reboot|halt|poweroff)\b", re.IGNORECASE),
+_BLOCK_SOURCES: list[str] = [
+    r"\brm\s+-rf\s+/",
+    r"\bsudo\b",
+    r"\bsu\s+-\b",
+    r"\bmkfs\b",
+    r"\bdd\s+if=",
+    r":\s*\(\s*\)\s*\{.*\}",  # fork bombs
+    r"\bchmod\s+777\s+/",
+    r"\bcurl\b.*\|\s*(?:ba)?sh",
+    r"\bwget\b.*\|\s*(?:ba)?sh",
+    r"\b(?:shutdown|reboot|halt|poweroff)\b",
 ]
 
+# One alternation so each command is scanned once; the group name maps a
+# match back to its source pattern for the error message. google-re2, when
+# installed, matches in linear time so the .* segments can't backtrack. The
+# inline (?i) flag is understood by both engines.
+_BLOCK_RE = (re2 if _re2_available else re).compile(
+    "(?i)" + "|".join(f"(?P<b{i}>{p})" for i, p in enumerate(_BLOCK_SOURCES))
+)
+
 
 def _ensure_workspace() -> Path:
-    WORKSPACE.mkdir(parents=True, exist_ok=True)
-    return WORKSPACE
+    """Create the workspace on first use and return its resolved path."""
+    global _workspace_resolved
+    if _workspace_resolved is None:
+        WORKSPACE.mkdir(parents=True, exist_ok=True)
+        _workspace_resolved = WORKSPACE.resolve()
+    return _workspace_resolved
 
 
 def _resolve_working_dir(working_dir: str | None) -> Path:
@@ -44,16 +73,31 @@ def _resolve_working_dir(working_dir: str | None) -> Path:
         return base
     # Resolve relative to workspace, block path traversal
     candidate = (base / working_dir).resolve()
-    if not str(candidate).startswith(str(base)):
+    if not candidate.is_relative_to(base):
         raise ValueError(f"Working directory escapes sandbox: {working_dir!r}")
     candidate.mkdir(parents=True, exist_ok=True)
     return candidate
 
 
 def _check_blocklist(command: str) -> None:
-    for pattern in _BLOCKLIST:
-        if pattern.search(command):
-            raise ValueError(f"Command contains a blocked pattern: {pattern.pattern!r}")
+    m = _BLOCK_RE.search(command)
+    if m:
+        pattern = _BLOCK_SOURCES[int(m.lastgroup[1:])]
+        raise ValueError(f"Command contains a blocked pattern: {pattern!r}")
+
+
+def _format_output(stdout: bytes, stderr: bytes, returncode: int | None) -> str:
+    """Join stripped stdout/stderr as bytes and decode once."""
+    out = stdout.strip()
+    err = stderr.strip()
+    parts = []
+    if out:
+        parts.append(out)
+    if err:
+        parts.append(b"[stderr]\n" + err)
+    if not parts:
+        return f"(exit code {returncode})"
+    return b"\n".join(parts).decode(errors="replace")
 
 
 async def run_shell(
@@ -97,18 +141,10 @@ async def _run_bash(command: str, cwd: Path, timeout: int) -> str:
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
             cwd=str(cwd),
+            env=_SUB_ENV,
         )
         stdout, stderr = await proc.communicate()
-        out = stdout.decode(errors="replace")
-        err = stderr.decode(errors="replace")
-        parts = []
-        if out.strip():
-            parts.append(out.strip())
-        if err.strip():
-            parts.append(f"[stderr]\n{err.strip()}")
-        if not parts:
-            return f"(exit code {proc.returncode})"
-        return "\n".join(parts)
+        return _format_output(stdout, stderr, proc.returncode)
 
     try:
         return await asyncio.wait_for(_exec(), timeout=timeout)
@@ -118,36 +154,18 @@ async def _run_bash(command: str, cwd: Path, timeout: int) -> str:
 
 async def _run_python(script: str, cwd: Path, timeout: int) -> str:
     async def _exec():
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".py", dir=str(cwd), delete=False
-        ) as f:
-            f.write(script)
-            tmpfile = f.name
-
-        try:
-            proc = await asyncio.create_subprocess_exec(
-                sys.executable, tmpfile,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=str(cwd),
-            )
-            stdout, stderr = await proc.communicate()
-        finally:
-            try:
-                os.unlink(tmpfile)
-            except OSError:
-                pass
-
-        out = stdout.decode(errors="replace")
-        err = stderr.decode(errors="replace")
-        parts = []
-        if out.strip():
-            parts.append(out.strip())
-        if err.strip():
-            parts.append(f"[stderr]\n{err.strip()}")
-        if not parts:
-            return f"(exit code {proc.returncode})"
-        return "\n".join(parts)
+        # Feed the script on stdin instead of round-tripping through a temp file
+        proc = await asyncio.create_subprocess_exec(
+            _PY_EXE, "-",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=str(cwd),
+            env=_SUB_ENV,
+        )
+        stdout, stderr = await proc.communicate(input=script.encode())
+
+        return _format_output(stdout, stderr, proc.returncode)
 
     try:
         return await asyncio.wait_for(_exec(), timeout=timeout)
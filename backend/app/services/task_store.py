@@ -0,0 +1,98 @@
+"""
+Task Store  SQLite spill-over for finished background tasks.
+
+background_agent keeps recent tasks in memory and moves finished ones here
+when its in-memory store is full.
+
+DB file: agentforge_tasks.db (in the backend root directory)
+Table:   background_tasks
+  task_id     TEXT PRIMARY KEY
+  status      TEXT
+  result      TEXT
+  created_at  TEXT (ISO-8601 UTC)
+  user_input  TEXT
+  flow_json   TEXT (JSON serialization of FlowGraph)
+"""
+
+import sqlite3
+from pathlib import Path
+
+from app.models.schema import BackgroundTask, FlowGraph
+
+_DB_PATH = Path(__file__).parent.parent.parent / "agentforge_tasks.db"
+
+
+def _conn() -> sqlite3.Connection:
+    conn = sqlite3.connect(_DB_PATH)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _to_task(row: sqlite3.Row) -> BackgroundTask:
+    return BackgroundTask(
+        task_id=row["task_id"],
+        status=row["status"],
+        result=row["result"],
+        created_at=row["created_at"],
+        flow=FlowGraph.model_validate_json(row["flow_json"]),
+        user_input=row["user_input"],
+    )
+
+
+def init_db() -> None:
+    """Create the background_tasks table if it doesn't exist. Call on startup."""
+    with _conn() as conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS background_tasks (
+                task_id    TEXT PRIMARY KEY,
+                status     TEXT NOT NULL,
+                result     TEXT,
+                created_at TEXT NOT NULL,
+                user_input TEXT NOT NULL DEFAULT '',
+                flow_json  TEXT NOT NULL DEFAULT '{}'
+            )
+        """)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_background_tasks_created "
+            "ON background_tasks (created_at)"
+        )
+        conn.commit()
+
+
+def save_task(task: BackgroundTask) -> None:
+    with _conn() as conn:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO background_tasks
+                (task_id, status, result, created_at, user_input, flow_json)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (task.task_id, task.status.value, task.result, task.created_at,
+             task.user_input, task.flow.model_dump_json()),
+        )
+        conn.commit()
+
+
+def get_task(task_id: str) -> BackgroundTask | None:
+    with _conn() as conn:
+        row = conn.execute(
+            "SELECT * FROM background_tasks WHERE task_id = ?", (task_id,)
+        ).fetchone()
+    return _to_task(row) if row else None
+
+
+def list_tasks(limit: int = 100) -> list[BackgroundTask]:
+    """Return the newest persisted tasks first."""
+    with _conn() as conn:
+        rows = conn.execute(
+            "SELECT * FROM background_tasks ORDER BY created_at DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+    return [_to_task(r) for r in rows]
+
+
+def delete_task(task_id: str) -> bool:
+    with _conn() as conn:
+        cursor = conn.execute("DELETE FROM background_tasks WHERE task_id = ?", (task_id,))
+        conn.commit()
+    return cursor.rowcount > 0
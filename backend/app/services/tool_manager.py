@@ -6,104 +6,169 @@ Each tool is a simple async function: (params: dict)  str
 import asyncio
 import csv
 import difflib
-import httpx
 import io
 import json
 import math
 import operator
 import os
 import re
-import subprocess
+import time
+from collections import OrderedDict
 from datetime import datetime, timezone
 from pathlib import Path
-from urllib.parse import quote_plus
+from urllib.parse import quote_plus, urlparse
+import orjson
 from ddgs import DDGS
+from app.services.http_client import get_client
 from app.services import shell_executor as shell_svc
 
 SANDBOX_DIR = Path("/tmp/agentforge")
 SANDBOX_DIR.mkdir(exist_ok=True)
 CUSTOM_TOOLS_FILE = Path.home() / ".agentforge" / "custom_tools.json"
 
+_WS_COLLAPSE   = re.compile(r"\s+")
+_SENTENCE_END  = re.compile(r"(?<=[.!?])\s+")
+_NON_ALNUM     = re.compile(r"[^a-z0-9]+")
+
+# Recent web_search results keyed by the normalised query, so agent retries
+# and ReAct loops don't repeat the same DuckDuckGo round-trip
+SEARCH_CACHE_SIZE = 256
+SEARCH_CACHE_TTL  = 300.0
+_search_cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+
+# In-flight http_request GETs by URL; concurrent callers share one request
+_inflight_gets: dict[str, asyncio.Task] = {}
+
 
 #  Tool implementations 
 
 async def _web_search(params: dict) -> str:
-    query = params.get("query", "").strip()
+    # Sanitize: collapse whitespace/newlines, limit to 200 chars
+    query = _WS_COLLAPSE.sub(" ", params.get("query") or "").strip()[:200]
     if not query:
         return "No query provided."
-    # Sanitize: collapse whitespace/newlines, limit to 200 chars
-    query = re.sub(r'\s+', ' ', query)[:200]
+    key = query.lower()
+    hit = _search_cache.get(key)
+    if hit is not None:
+        if time.monotonic() < hit[0]:
+            _search_cache.move_to_end(key)
+            return hit[1]
+        del _search_cache[key]
     try:
-        loop = asyncio.get_event_loop()
-        results = await loop.run_in_executor(
-            None,
-            lambda: list(DDGS().text(query, max_results=5))
-        )
-        if not results:
-            return "No results found."
+        # ddgs parses the result page itself; just keep its blocking
+        # request off the event loop
+        results = await asyncio.to_thread(DDGS().text, query, max_results=5)
+    except Exception as e:
+        return f"Search failed: {e}"
+    if not results:
+        output = "No results found."
+    else:
         lines = []
         for r in results:
             title = r.get("title", "")
             href  = r.get("href", "")
             body  = r.get("body", "")
             lines.append(f" {title}\n  {href}\n  {body}")
-        return "\n\n".join(lines)
-    except Exception as e:
-        return f"Search failed: {e}"
+        output = "\n\n".join(lines)
+    _search_cache[key] = (time.monotonic() + SEARCH_CACHE_TTL, output)
+    while len(_search_cache) > SEARCH_CACHE_SIZE:
+        _search_cache.popitem(last=False)
+    return output
+
+
+def _json_body(body, headers: dict | None = None) -> dict:
+    """httpx kwargs sending body as orjson-encoded JSON (json= goes through stdlib json)."""
+    headers = dict(headers or {})
+    if body is None:
+        return {"headers": headers}
+    if not any(k.lower() == "content-type" for k in headers):
+        headers["Content-Type"] = "application/json"
+    return {"content": orjson.dumps(body), "headers": headers}
+
+
+async def _coalesced_get(client, url: str):
+    task = _inflight_gets.get(url)
+    if task is None:
+        task = asyncio.ensure_future(client.get(url, timeout=15.0, follow_redirects=True))
+        _inflight_gets[url] = task
+
+        def _forget(t: asyncio.Task) -> None:
+            if _inflight_gets.get(url) is t:
+                del _inflight_gets[url]
+
+        task.add_done_callback(_forget)
+    # Shield so one cancelled caller doesn't cancel the request for the others
+    return await asyncio.shield(task)
 
 
 async def _http_request(params: dict) -> str:
-    url    = params.get("url", "")
-    method = params.get("method", "GET").upper()
+    url    = (params.get("url") or "").strip()
+    if not url:
+        return "No URL provided."
+    if urlparse(url).scheme not in ("http", "https"):
+        return f"Invalid URL (expected http:// or https://): {url}"
+    method = (params.get("method") or "GET").upper()
     body   = params.get("body", None)
     if isinstance(body, str):
         stripped = body.strip()
         if stripped.startswith("{") or stripped.startswith("["):
             try:
-                body = json.loads(stripped)
+                body = orjson.loads(stripped)
             except Exception:
                 pass
-    if not url:
-        return "No URL provided."
-    async with httpx.AsyncClient(timeout=15.0, follow_redirects=True) as client:
-        try:
-            if method == "POST":
-                resp = await client.post(url, json=body)
-            else:
-                resp = await client.get(url)
-            return resp.text[:2000]
-        except Exception as e:
-            return f"HTTP request failed: {e}"
+    # Pooled shared client: repeat calls to a host skip the TCP/TLS handshake
+    client = get_client()
+    try:
+        if method == "POST":
+            resp = await client.post(url, **_json_body(body), timeout=15.0, follow_redirects=True)
+        else:
+            resp = await _coalesced_get(client, url)
+        return resp.text[:2000]
+    except Exception as e:
+        return f"HTTP request failed: {e}"
 
 
 async def _code_runner(params: dict) -> str:
-    code = params.get("code", "")
-    if not code:
+    code = params.get("code") or ""
+    if not code.strip():
         return "No code provided."
-    script = SANDBOX_DIR / "script.py"
-    script.write_text(code)
     try:
-        result = subprocess.run(
-            ["python3", str(script)],
-            capture_output=True, text=True, timeout=10,
+        proc = await asyncio.create_subprocess_exec(
+            "python3", "-",
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=str(SANDBOX_DIR),
         )
-        out = result.stdout[:1500]
-        err = result.stderr[:500]
+        try:
+            out_b, err_b = await asyncio.wait_for(proc.communicate(code.encode()), timeout=10)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return "Code execution timed out (10s limit)."
+        out = out_b.decode(errors="replace")[:1500]
+        err = err_b.decode(errors="replace")[:500]
         return out if out else (f"STDERR: {err}" if err else "(no output)")
-    except subprocess.TimeoutExpired:
-        return "Code execution timed out (10s limit)."
     except Exception as e:
         return f"Code runner error: {e}"
 
 
 async def _file_reader(params: dict) -> str:
-    filename = params.get("filename", "")
+    filename = params.get("filename") or ""
     if not filename:
         return "No filename provided."
-    target = SANDBOX_DIR / Path(filename).name   # sandbox-only
+    if "/" in filename or "\\" in filename or filename in (".", ".."):
+        return f"Invalid filename (sandbox files only, no directories): {filename}"
+    target = SANDBOX_DIR / filename
     if not target.exists():
         return f"File not found in sandbox: {filename}"
-    return target.read_text()[:3000]
+    return await asyncio.to_thread(_read_head, target, 3000)
+
+
+def _read_head(path: Path, limit: int) -> str:
+    """Read at most limit characters instead of loading the whole file."""
+    with path.open("r", errors="replace") as f:
+        return f.read(limit)
 
 
 async def _summarize(params: dict) -> str:
@@ -177,7 +242,7 @@ async def _text_splitter(params: dict) -> str:
         return json.dumps(lines, ensure_ascii=False)
 
     if mode == "sentences":
-        sentences = re.split(r'(?<=[.!?])\s+', text.strip())
+        sentences = _SENTENCE_END.split(text.strip())
         return json.dumps(sentences, ensure_ascii=False)
 
     # Default: character-based chunks with overlap
@@ -409,12 +474,14 @@ async def _run_custom_tool(tool: dict, params: dict) -> str:
         if not url:
             return "Custom HTTP tool misconfigured: missing URL."
         try:
-            async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
-                if method in {"POST", "PUT", "PATCH", "DELETE"}:
-                    resp = await client.request(method, url, headers=headers, json=body)
-                else:
-                    resp = await client.request(method, url, headers=headers, params=params)
-                return f"[HTTP {resp.status_code}] {resp.text[:3000]}"
+            client = get_client()
+            if method in {"POST", "PUT", "PATCH", "DELETE"}:
+                resp = await client.request(method, url, **_json_body(body, headers),
+                                            timeout=timeout, follow_redirects=True)
+            else:
+                resp = await client.request(method, url, headers=headers, params=params,
+                                            timeout=timeout, follow_redirects=True)
+            return f"[HTTP {resp.status_code}] {resp.text[:3000]}"
         except Exception as exc:
             return f"[Custom HTTP tool error] {exc}"
 
@@ -464,7 +531,7 @@ _ALIASES: dict[str, str] = {
 
 
 def _norm(value: str | None) -> str:
-    return re.sub(r"[^a-z0-9]+", "_", (value or "").strip().lower()).strip("_")
+    return _NON_ALNUM.sub("_", (value or "").strip().lower()).strip("_")
 
 
 def _resolve_by_hint(hint: str | None) -> str | None:
@@ -0,0 +1,32 @@
+"""
+ORJSONResponse  JSONResponse that renders with orjson.
+Installed as the app-wide default_response_class in main.py.
+
+ORJSON_OPTS / orjson_default are shared with the SSE encoders so every
+orjson.dumps call uses the same prebuilt option mask.
+"""
+
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+import orjson
+from fastapi.responses import JSONResponse
+
+ORJSON_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+
+
+def orjson_default(obj: Any) -> Any:
+    """Fallback for types orjson doesn't handle natively."""
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, UUID):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class ORJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=orjson_default, option=ORJSON_OPTS)
@@ -0,0 +1,14 @@
+"""Pre-encoded Server-Sent Events framing shared by the streaming routes."""
+
+import orjson
+
+from app.utils.orjson_response import ORJSON_OPTS, orjson_default
+
+DATA_PREFIX = b"data: "
+DATA_SUFFIX = b"\n\n"
+DONE_FRAME  = b"data: [DONE]\n\n"
+
+
+def sse_event(event: dict) -> bytes:
+    """Encode one event as a complete `data: ...` SSE frame."""
+    return DATA_PREFIX + orjson.dumps(event, default=orjson_default, option=ORJSON_OPTS) + DATA_SUFFIX